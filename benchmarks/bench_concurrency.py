@@ -0,0 +1,44 @@
+"""
+Benchmark scrape_products: mode sequential vs concurrent terhadap fixture server lokal.
+
+    python -m benchmarks.bench_concurrency --pages 50 500 5000 --latency 0.05
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.fixture_server import start_fixture_server
+from utils.extract import scrape_products
+
+def run(base_url, pages, **kwargs):
+    """Jalankan scrape_products dan kembalikan (detik, jumlah produk)."""
+    start = time.perf_counter()
+    with contextlib.redirect_stdout(io.StringIO()):
+        products = scrape_products(base_url, start_page=1, max_pages=pages, **kwargs)
+    return time.perf_counter() - start, len(products)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, nargs="+", default=[50, 500, 5000])
+    parser.add_argument("--latency", type=float, default=0.05, help="latency server per request (detik)")
+    parser.add_argument("--delay", type=float, default=0.0, help="delay mode sequential (detik)")
+    parser.add_argument("--workers", type=int, default=16)
+    parser.add_argument("--rps", type=float, default=None, help="batas requests per detik mode concurrent")
+    args = parser.parse_args()
+
+    print(f"{'pages':>6} | {'sequential (s)':>14} | {'concurrent (s)':>14} | {'speedup':>7}")
+    print("-" * 52)
+    for pages in args.pages:
+        server, base_url = start_fixture_server(latency=args.latency, total_pages=pages)
+        try:
+            seq_time, seq_count = run(base_url, pages, delay=args.delay)
+            con_time, con_count = run(base_url, pages, max_workers=args.workers, requests_per_second=args.rps)
+        finally:
+            server.shutdown()
+        assert seq_count == con_count, "hasil sequential dan concurrent berbeda"
+        print(f"{pages:>6} | {seq_time:>14.2f} | {con_time:>14.2f} | {seq_time / con_time:>6.1f}x")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Benchmark scaling parsing di process pool (parse_workers) terhadap fixture server lokal.
+
+    python -m benchmarks.bench_parse_pool --pages 500 --workers 1 2 4 8
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import time
+
+from benchmarks.fixture_server import start_fixture_server
+from utils.extract import scrape_products
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 2, 4, os.cpu_count() or 1])
+    parser.add_argument("--io-workers", type=int, default=16)
+    parser.add_argument("--parser", default="strainer")
+    args = parser.parse_args()
+
+    server, base_url = start_fixture_server(total_pages=args.pages)
+    baseline = None
+    print(f"cpu count: {os.cpu_count()}")
+    print(f"{'parse_workers':>13} | {'seconds':>8} | {'pages/sec':>9} | {'speedup':>7}")
+    print("-" * 48)
+    try:
+        for workers in sorted(set(args.workers)):
+            start = time.perf_counter()
+            with contextlib.redirect_stdout(io.StringIO()):
+                scrape_products(base_url, 1, args.pages, max_workers=args.io_workers,
+                                parser=args.parser, parse_workers=workers if workers > 1 else None)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            print(f"{workers:>13} | {seconds:>8.2f} | {args.pages / seconds:>9.0f} | {baseline / seconds:>6.1f}x")
+    finally:
+        server.shutdown()
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,46 @@
+"""
+Benchmark throughput parser backend (products/sec) pada corpus HTML yang sama.
+
+    python -m benchmarks.bench_parsers --pages 200
+"""
+
+import argparse
+import contextlib
+import io
+import time
+
+from benchmarks.fixture_server import render_page
+from utils.extract import PARSER_BACKENDS, parse_products, resolve_parser
+
+def bench(parser, corpus):
+    """Parse seluruh corpus; kembalikan (detik, jumlah produk, records)."""
+    records = []
+    start = time.perf_counter()
+    for content in corpus:
+        records.extend(parse_products(content, parser)[1])
+    return time.perf_counter() - start, len(records), records
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=200)
+    parser.add_argument("--products-per-page", type=int, default=20)
+    args = parser.parse_args()
+
+    corpus = [render_page(page, args.products_per_page, args.pages).encode("utf-8") for page in range(1, args.pages + 1)]
+    baseline = None
+
+    print(f"{'backend':>12} | {'seconds':>8} | {'products/sec':>12} | {'speedup':>7} | parity")
+    print("-" * 60)
+    for backend in PARSER_BACKENDS:
+        with contextlib.redirect_stdout(io.StringIO()):
+            if resolve_parser(backend) != backend:
+                continue
+        seconds, count, records = bench(backend, corpus)
+        rows = [{k: v for k, v in r.items() if k != "Timestamp"} for r in records]
+        if baseline is None:
+            baseline = (seconds, rows)
+        print(f"{backend:>12} | {seconds:>8.3f} | {count / seconds:>12.0f} | "
+              f"{baseline[0] / seconds:>6.1f}x | {'ok' if rows == baseline[1] else 'MISMATCH'}")
+
+if __name__ == "__main__":
+    main()
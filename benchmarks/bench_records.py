@@ -0,0 +1,64 @@
+"""
+Benchmark representasi record: list dict per produk vs ProductBatch kolumnar.
+
+    python -m benchmarks.bench_records --sizes 100000 500000
+"""
+
+import argparse
+import time
+import tracemalloc
+from datetime import datetime
+
+from utils.records import ProductBatch, ProductRecord
+
+PRODUCTS_PER_PAGE = 20
+
+def fields(i):
+    return (f"T-shirt {i}", f"${i % 500}.99", "⭐ 4.5 / 5", f"{i % 8}", "M", "Men")
+
+def build_dicts(n):
+    """Cara lama: dict baru + strftime untuk setiap produk, lalu DataFrame dari list dict."""
+    rows = []
+    for i in range(n):
+        title, price, rating, color, size, gender = fields(i)
+        rows.append({
+            "Title": title, "Price": price, "Rating": rating, "Color": color,
+            "Size": size, "Gender": gender,
+            "Timestamp": datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+        })
+    import pandas as pd
+    return pd.DataFrame(rows)
+
+def build_batch(n):
+    """Cara baru: ProductRecord dengan timestamp per halaman, ditambahkan ke kolom."""
+    batch = ProductBatch()
+    timestamp = None
+    for i in range(n):
+        if i % PRODUCTS_PER_PAGE == 0:
+            timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        batch.append(ProductRecord(*fields(i), timestamp))
+    return batch.to_dataframe()
+
+def measure(func, n):
+    tracemalloc.start()
+    start = time.perf_counter()
+    df = func(n)
+    seconds = time.perf_counter() - start
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return seconds, peak / 1024 / 1024, len(df)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--sizes", type=int, nargs="+", default=[100_000, 500_000])
+    args = parser.parse_args()
+
+    print(f"{'products':>9} | {'dict s':>7} | {'dict MiB':>8} | {'batch s':>7} | {'batch MiB':>9}")
+    print("-" * 53)
+    for n in args.sizes:
+        dict_s, dict_mb, _ = measure(build_dicts, n)
+        batch_s, batch_mb, _ = measure(build_batch, n)
+        print(f"{n:>9} | {dict_s:>7.2f} | {dict_mb:>8.1f} | {batch_s:>7.2f} | {batch_mb:>9.1f}")
+
+if __name__ == "__main__":
+    main()
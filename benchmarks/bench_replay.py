@@ -0,0 +1,47 @@
+"""
+Benchmark tahap CPU (parse + transform) secara terisolasi dengan replay arsip HTML.
+
+    python -m benchmarks.bench_replay --pages 500 --parser selectolax
+"""
+
+import argparse
+import contextlib
+import io
+import logging
+import tempfile
+import time
+
+from benchmarks.fixture_server import render_page
+from utils.archive import PageArchive
+from utils.extract import DEFAULT_PARSER, replay_products
+from utils.transform import transform_product_data
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--pages", type=int, default=500)
+    parser.add_argument("--parser", default=DEFAULT_PARSER)
+    args = parser.parse_args()
+    logging.disable(logging.INFO)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        archive = PageArchive(f"{tmp}/pages.seg")
+        start = time.perf_counter()
+        for page in range(1, args.pages + 1):
+            archive.append(page, f"fixture://{page}", render_page(page, total_pages=args.pages))
+        archive_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        with contextlib.redirect_stdout(io.StringIO()):
+            raw = replay_products(archive, parser=args.parser)
+        parse_time = time.perf_counter() - start
+
+        start = time.perf_counter()
+        df = transform_product_data(raw)
+        transform_time = time.perf_counter() - start
+
+    print(f"archive write ({archive.codec}): {archive_time:.2f}s for {args.pages} pages")
+    print(f"replay + parse ({args.parser}):  {parse_time:.2f}s, {len(raw)} records")
+    print(f"transform:                 {transform_time:.2f}s, {len(df)} rows")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""
+Benchmark sink file: load_to_csv vs load_to_parquet (Parquet zstd/snappy, Feather zstd).
+Mengukur waktu tulis, ukuran total di disk dan waktu baca kembali.
+
+    python -m benchmarks.bench_sinks --rows 10000 100000 1000000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import tempfile
+import time
+
+import pandas as pd
+import pyarrow.dataset as ds
+
+from benchmarks.bench_load import make_products
+from utils.load import load_to_csv, load_to_parquet
+
+SINKS = (
+    ("csv", None, None),
+    ("parquet", "parquet", "zstd"),
+    ("parquet", "parquet", "snappy"),
+    ("feather", "feather", "zstd"),
+)
+
+def disk_size(path):
+    if os.path.isfile(path):
+        return os.path.getsize(path)
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+def write(data, path, file_format, compression):
+    with contextlib.redirect_stdout(io.StringIO()):
+        if file_format is None:
+            load_to_csv(data, path)
+        else:
+            load_to_parquet(data, path, compression=compression, file_format=file_format)
+
+def read(path, file_format):
+    if file_format is None:
+        return pd.read_csv(path)
+    fmt = "parquet" if file_format == "parquet" else "ipc"
+    return ds.dataset(path, format=fmt, partitioning="hive").to_table().to_pandas()
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+
+    print(f"{'rows':>9} | {'sink':>16} | {'write (s)':>9} | {'rows/sec':>10} | {'size (MiB)':>10} | {'read (s)':>8}")
+    print("-" * 78)
+    for rows in args.rows:
+        data = make_products(rows)
+        with tempfile.TemporaryDirectory() as tmp:
+            for name, file_format, compression in SINKS:
+                path = os.path.join(tmp, f"{name}-{compression}" + (".csv" if file_format is None else ""))
+                start = time.perf_counter()
+                write(data, path, file_format, compression)
+                write_s = time.perf_counter() - start
+                start = time.perf_counter()
+                read(path, file_format)
+                read_s = time.perf_counter() - start
+                label = name if compression is None else f"{name} {compression}"
+                print(f"{rows:>9} | {label:>16} | {write_s:>9.3f} | {rows / write_s:>10.0f} | "
+                      f"{disk_size(path) / 2**20:>10.2f} | {read_s:>8.3f}")
+
+if __name__ == "__main__":
+    main()
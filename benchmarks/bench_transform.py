@@ -0,0 +1,67 @@
+"""
+Benchmark transform_product_data: implementasi lama (filter berantai + apply per baris)
+vs pipeline vektor satu kali filter. Output keduanya dibandingkan dulu.
+
+    python -m benchmarks.bench_transform --rows 10000 100000 1000000
+"""
+
+import argparse
+import logging
+import random
+import time
+
+import pandas as pd
+
+from utils.transform import transform_product_data
+
+def legacy_transform_product_data(raw_data):
+    """Salinan transform_product_data sebelum divektorisasi (sebagai baseline)."""
+    df = pd.DataFrame(raw_data)
+    df = df[df.apply(lambda row: row['Title'] is not None, axis=1)]
+    df = df[df['Title'] != 'Unknown Product']
+    df = df[~df['Price'].isin(['Price Unavailable', None])]
+    df = df[~df['Rating'].str.contains('Invalid|Not Rated', regex=True, na=False)]
+    df['Price'] = (df['Price'].str.replace(r'[^0-9.]', '', regex=True).astype(float) * 16000).astype(int)
+    df['Rating'] = df['Rating'].str.replace('⭐', '').str.strip()
+    df['Rating'] = df['Rating'].str.extract(r'([\d.]+)')[0]
+    df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce')
+    df = df[df['Rating'].notna()]
+    return df.reset_index(drop=True)
+
+def make_raw_data(rows, seed=0):
+    """Data mentah sintetis dengan proporsi data invalid mirip hasil scraping."""
+    rng = random.Random(seed)
+    titles = ["T-shirt", "Hoodie", "Pants", "Jacket", "Unknown Product", None]
+    prices = [f"${rng.uniform(10, 500):.2f}" for _ in range(200)] + ["Price Unavailable", None]
+    ratings = [f"⭐ {rng.uniform(1, 5):.1f} / 5" for _ in range(40)] + ["⭐ Invalid Rating / 5", "Not Rated", None, "⭐ ."]
+    return [
+        {
+            "Title": rng.choice(titles), "Price": rng.choice(prices), "Rating": rng.choice(ratings),
+            "Color": f"{rng.randint(1, 8)}", "Size": rng.choice(["S", "M", "L", "XL"]),
+            "Gender": rng.choice(["Men", "Women", "Unisex"]), "Timestamp": "2024-01-01 10:00:00",
+        }
+        for _ in range(rows)
+    ]
+
+def timed(func, raw):
+    start = time.perf_counter()
+    result = func(raw)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'rows':>9} | {'legacy (s)':>10} | {'vectorized (s)':>14} | {'speedup':>7} | output")
+    print("-" * 62)
+    for rows in args.rows:
+        raw = make_raw_data(rows)
+        legacy_s, expected = timed(legacy_transform_product_data, raw)
+        new_s, actual = timed(transform_product_data, raw)
+        same = "identical" if actual.equals(expected) else "DIFFERENT"
+        print(f"{rows:>9} | {legacy_s:>10.3f} | {new_s:>14.3f} | {legacy_s / new_s:>6.1f}x | {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,44 @@
+"""
+Benchmark transform_product_data per engine (pandas, pyarrow, polars). Output setiap
+engine dibandingkan dulu dengan engine pandas.
+
+    python -m benchmarks.bench_transform_engines --rows 10000 100000 1000000
+"""
+
+import argparse
+import logging
+import time
+
+from benchmarks.bench_transform import make_raw_data
+from utils.transform import TRANSFORM_ENGINES, resolve_engine, transform_product_data
+
+def plain(df):
+    return df.astype(object).where(df.notna(), None)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 100_000, 1_000_000])
+    parser.add_argument("--engines", nargs="+", default=list(TRANSFORM_ENGINES), choices=TRANSFORM_ENGINES)
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"{'rows':>9} | {'engine':>8} | {'seconds':>8} | {'speedup':>7} | {'memory (MiB)':>12} | output")
+    print("-" * 70)
+    for rows in args.rows:
+        raw = make_raw_data(rows)
+        expected = plain(transform_product_data(raw))
+        baseline = None
+        for engine in args.engines:
+            if resolve_engine(engine) != engine:
+                print(f"{rows:>9} | {engine:>8} | not installed")
+                continue
+            start = time.perf_counter()
+            result = transform_product_data(raw, engine=engine)
+            seconds = time.perf_counter() - start
+            baseline = baseline or seconds
+            memory = result.memory_usage(deep=True).sum() / 2**20
+            same = "identical" if plain(result).equals(expected) else "DIFFERENT"
+            print(f"{rows:>9} | {engine:>8} | {seconds:>8.3f} | {baseline / seconds:>6.1f}x | {memory:>12.1f} | {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,42 @@
+"""
+Benchmark transform_product_data (satu proses) vs transform_product_data_parallel
+untuk mencari titik crossover ukuran input. Output keduanya dibandingkan dulu.
+
+    python -m benchmarks.bench_transform_parallel --rows 10000 100000 1000000 --workers 2 4
+"""
+
+import argparse
+import logging
+import os
+import time
+
+from benchmarks.bench_transform import make_raw_data
+from utils.transform import transform_product_data, transform_product_data_parallel
+
+def timed(func, *args, **kwargs):
+    start = time.perf_counter()
+    result = func(*args, **kwargs)
+    return time.perf_counter() - start, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--rows", type=int, nargs="+", default=[10_000, 50_000, 200_000, 1_000_000])
+    parser.add_argument("--workers", type=int, nargs="+", default=[2, os.cpu_count() or 1])
+    args = parser.parse_args()
+    logging.disable(logging.WARNING)
+
+    print(f"cpu count: {os.cpu_count()}")
+    print(f"{'rows':>9} | {'workers':>7} | {'single (s)':>10} | {'parallel (s)':>12} | {'speedup':>7} | output")
+    print("-" * 70)
+    for rows in args.rows:
+        raw = make_raw_data(rows)
+        single_s, expected = timed(transform_product_data, raw)
+        for workers in sorted(set(w for w in args.workers if w > 1)):
+            # min_rows=0 memaksa mode paralel agar crossover terlihat
+            parallel_s, actual = timed(transform_product_data_parallel, raw, workers, min_rows=0)
+            same = "identical" if actual.equals(expected) else "DIFFERENT"
+            print(f"{rows:>9} | {workers:>7} | {single_s:>10.3f} | {parallel_s:>12.3f} | "
+                  f"{single_s / parallel_s:>6.2f}x | {same}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,100 @@
+"""
+Local HTTP server yang meniru halaman fashion-studio untuk benchmark.
+Jalankan langsung (python -m benchmarks.fixture_server) atau pakai
+`start_fixture_server()` dari script benchmark lain.
+"""
+
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+PRODUCT_TEMPLATE = """
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">{title}</h3>
+            <div class="price-container"><span class="price">{price}</span></div>
+            <p style="font-size: 14px; color: #777;">Rating: {rating}</p>
+            <p style="font-size: 14px; color: #777;">{colors} Colors</p>
+            <p style="font-size: 14px; color: #777;">Size: {size}</p>
+            <p style="font-size: 14px; color: #777;">Gender: {gender}</p>
+        </div>
+    </div>"""
+
+def render_page(page, products_per_page=20, total_pages=50):
+    """Buat HTML satu halaman katalog secara deterministik."""
+    rng = random.Random(page)
+    cards = []
+    if page <= total_pages:
+        for i in range(products_per_page):
+            cards.append(PRODUCT_TEMPLATE.format(
+                title=f"T-shirt {(page - 1) * products_per_page + i + 1}",
+                price=f"${rng.uniform(10, 500):.2f}" if rng.random() > 0.05 else "Price Unavailable",
+                rating=f"⭐ {rng.uniform(1, 5):.1f} / 5" if rng.random() > 0.05 else "Invalid Rating / 5",
+                colors=rng.randint(1, 8),
+                size=rng.choice(["S", "M", "L", "XL", "XXL"]),
+                gender=rng.choice(["Men", "Women", "Unisex"]),
+            ))
+    pager = ""
+    if page <= total_pages:
+        next_item = (
+            f'<li class="page-item next"><a class="page-link" href="/?page={page + 1}">Next</a></li>'
+            if page < total_pages else ""
+        )
+        pager = (
+            '<ul class="pagination">'
+            f'<li class="page-item current"><span class="page-link">Page {page} of {total_pages}</span></li>'
+            f"{next_item}</ul>"
+        )
+    return (
+        "<html><head><title>Fashion Studio</title></head><body>"
+        f"<div class=\"collection-grid\" id=\"collectionList\">{''.join(cards)}</div>"
+        f"{pager}</body></html>"
+    )
+
+class FixtureHandler(BaseHTTPRequestHandler):
+    """Handler yang melayani /?page=N dengan latency buatan."""
+
+    def do_GET(self):
+        query = parse_qs(urlparse(self.path).query)
+        page = int(query.get("page", ["1"])[0])
+        if self.server.latency:
+            time.sleep(self.server.latency)
+        body = render_page(page, self.server.products_per_page, self.server.total_pages).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "text/html; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+class FixtureServer(ThreadingHTTPServer):
+    """ThreadingHTTPServer dengan listen backlog besar.
+
+    Backlog default (5) membuat burst pertama dari banyak worker terkena SYN
+    retransmit (~1 detik) sehingga perbandingan benchmark menjadi bias.
+    """
+
+    daemon_threads = True
+    request_queue_size = 128
+
+def start_fixture_server(latency=0.0, products_per_page=20, total_pages=50, handler=FixtureHandler):
+    """Jalankan fixture server di thread background; kembalikan (server, base_url)."""
+    server = FixtureServer(("127.0.0.1", 0), handler)
+    server.latency = latency
+    server.products_per_page = products_per_page
+    server.total_pages = total_pages
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    base_url = f"http://127.0.0.1:{server.server_address[1]}/?page={{}}"
+    return server, base_url
+
+if __name__ == "__main__":
+    server, base_url = start_fixture_server(latency=0.05)
+    print(f"Fixture server running at {base_url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -0,0 +1,80 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from utils import archive as archive_module
+from utils.archive import PageArchive
+from utils.extract import iter_pages, scrape_products, replay_products
+
+PAGE_HTML = '<div class="product-details"><h3 class="product-title">Product {}</h3><span class="price">$1.00</span></div>'
+
+class TestPageArchive:
+    """Test suite untuk PageArchive dan mode replay"""
+
+    @pytest.mark.parametrize("codec", ["gzip", "zstd"])
+    def test_append_and_iter_pages(self, tmp_path, codec):
+        """Test halaman yang diarsipkan bisa dibaca ulang sesuai urutan halaman"""
+        if codec == "zstd" and archive_module.zstandard is None:
+            pytest.skip("zstandard not installed")
+        archive = PageArchive(str(tmp_path / "pages.seg"), codec=codec, run_id="run-1")
+        archive.append(2, "https://example.com/2", PAGE_HTML.format(2))
+        archive.append(1, "https://example.com/1", PAGE_HTML.format(1).encode("utf-8"))
+
+        pages = list(archive.iter_pages())
+
+        assert [entry["page"] for entry, _ in pages] == [1, 2]
+        assert pages[0][1] == PAGE_HTML.format(1).encode("utf-8")
+
+    def test_runs_are_kept_separately(self, tmp_path):
+        """Test setiap run tersimpan terpisah dan default replay memakai run terakhir"""
+        path = str(tmp_path / "pages.seg")
+        PageArchive(path, run_id="old").append(1, "u", PAGE_HTML.format("old"))
+        PageArchive(path, run_id="new").append(1, "u", PAGE_HTML.format("new"))
+
+        archive = PageArchive(path)
+        assert archive.runs() == ["old", "new"]
+        assert replay_products(archive)[0]["Title"] == "Product new"
+        assert replay_products(archive, run_id="old")[0]["Title"] == "Product old"
+
+    def test_replay_empty_archive(self, tmp_path):
+        """Test replay dari arsip kosong mengembalikan list kosong"""
+        assert replay_products(PageArchive(str(tmp_path / "pages.seg"))) == []
+
+    @patch('utils.extract.requests.Session.get')
+    def test_scrape_then_replay_without_network(self, mock_get, tmp_path):
+        """Test hasil replay sama dengan hasil crawl tanpa request jaringan"""
+        def fake_get(url, **kwargs):
+            return MagicMock(status_code=200, content=PAGE_HTML.format(url[-1]).encode("utf-8"))
+
+        mock_get.side_effect = fake_get
+        archive = PageArchive(str(tmp_path / "pages.seg"))
+        scraped = scrape_products("https://example.com/?page={}", 1, 3, delay=0, max_workers=3, archive=archive)
+
+        mock_get.reset_mock()
+        replayed = replay_products(archive)
+
+        assert not mock_get.called
+        assert [p["Title"] for p in replayed] == [p["Title"] for p in scraped]
+
+    @patch('utils.extract.requests.Session.get')
+    def test_resume_keeps_archive_run(self, mock_get, tmp_path):
+        """Test crawl yang dilanjutkan dari checkpoint tetap mengarsipkan ke run yang sama"""
+        def fake_get(url, **kwargs):
+            return MagicMock(status_code=200, content=PAGE_HTML.format(url[-1]).encode("utf-8"))
+
+        mock_get.side_effect = fake_get
+        path = str(tmp_path / "pages.seg")
+        checkpoint = str(tmp_path / "crawl.sqlite")
+
+        # Simulasikan crash setelah 2 halaman
+        pages = iter_pages("https://example.com/?page={}", 1, 4, delay=0, checkpoint=checkpoint,
+                           archive=PageArchive(path, run_id="interrupted"))
+        next(pages)
+        next(pages)
+        pages.close()
+
+        resumed = PageArchive(path, run_id="resumed")
+        scraped = scrape_products("https://example.com/?page={}", 1, 4, delay=0, checkpoint=checkpoint,
+                                  resume=True, archive=resumed)
+
+        assert resumed.run_id == "interrupted"
+        assert resumed.runs() == ["interrupted"]
+        assert [p["Title"] for p in replay_products(resumed)] == [p["Title"] for p in scraped]
@@ -0,0 +1,78 @@
+import time
+import pytest
+from unittest.mock import MagicMock, patch
+from utils.cache import PageCache
+from utils.extract import scrape_products
+
+def _response(status_code, content=b"", headers=None):
+    response = MagicMock()
+    response.status_code = status_code
+    response.content = content
+    response.headers = headers or {}
+    return response
+
+class TestPageCache:
+    """Test suite untuk PageCache"""
+
+    def test_put_and_get(self, tmp_path):
+        """Test body, ETag dan Last-Modified tersimpan"""
+        cache = PageCache(str(tmp_path / "pages.sqlite"))
+        cache.put("https://example.com/1", b"<html>1</html>", '"abc"', "Wed, 21 Oct 2015 07:28:00 GMT")
+
+        assert cache.get("https://example.com/1") == (b"<html>1</html>", '"abc"', "Wed, 21 Oct 2015 07:28:00 GMT")
+        assert cache.get("https://example.com/2") is None
+
+    def test_conditional_get_serves_304_from_disk(self, tmp_path):
+        """Test 304 dilayani dari cache dan header kondisional dikirim"""
+        cache = PageCache(str(tmp_path / "pages.sqlite"))
+        fetch = MagicMock(side_effect=[
+            _response(200, b"<html>v1</html>", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 00:00:00 GMT"}),
+            _response(304),
+        ])
+
+        first = cache.fetch("https://example.com/1", fetch)
+        second = cache.fetch("https://example.com/1", fetch)
+
+        assert first.content == second.content == b"<html>v1</html>"
+        assert second.from_cache
+        fetch.assert_called_with({"If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 00:00:00 GMT"})
+        assert cache.stats()["hits"] == 1
+        assert cache.stats()["misses"] == 1
+
+    def test_lru_eviction_respects_max_bytes(self, tmp_path):
+        """Test entry yang paling lama tidak dipakai dihapus saat melebihi max_bytes"""
+        cache = PageCache(str(tmp_path / "pages.sqlite"), max_bytes=25)
+        cache.put("a", b"x" * 10)
+        time.sleep(0.01)
+        cache.put("b", b"x" * 10)
+        time.sleep(0.01)
+        cache.touch("a")
+        cache.put("c", b"x" * 10)
+
+        assert cache.get("a") is not None
+        assert cache.get("b") is None
+        assert cache.get("c") is not None
+        assert cache.stats()["bytes"] <= 25
+
+    def test_ttl_expires_entries(self, tmp_path):
+        """Test entry yang melewati TTL dianggap miss"""
+        cache = PageCache(str(tmp_path / "pages.sqlite"), ttl=60)
+        cache.put("a", b"body")
+
+        with patch('utils.cache.time.time', return_value=time.time() + 120):
+            assert cache.get("a") is None
+        assert cache.stats()["entries"] == 0
+
+    @patch('utils.extract.requests.Session.get')
+    def test_scrape_products_uses_cache(self, mock_get, tmp_path):
+        """Test scrape_products memakai cache pada run berikutnya"""
+        html = b'<div class="product-details"><h3 class="product-title">Cached</h3></div>'
+        mock_get.side_effect = [_response(200, html, {"ETag": '"p1"'}), _response(304)]
+        cache = PageCache(str(tmp_path / "pages.sqlite"))
+
+        first = scrape_products("https://example.com/page-{}.html", 1, 1, delay=0, cache=cache)
+        second = scrape_products("https://example.com/page-{}.html", 1, 1, delay=0, cache=cache)
+
+        assert first[0]['Title'] == second[0]['Title'] == "Cached"
+        assert mock_get.call_args.kwargs['headers'] == {"If-None-Match": '"p1"'}
+        assert cache.stats()["hits"] == 1
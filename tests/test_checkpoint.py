@@ -0,0 +1,64 @@
+import pytest
+from unittest.mock import MagicMock, patch
+from utils.checkpoint import CrawlCheckpoint
+from utils.extract import iter_pages, scrape_products
+from utils.records import PageInfo, ProductRecord
+
+BASE_URL = "https://example.com/page-{}.html"
+
+def _fake_get(url, **kwargs):
+    page = int(url.rsplit('-', 1)[1].split('.')[0])
+    return MagicMock(
+        status_code=200,
+        content=f'<div class="product-details"><h3 class="product-title">Product {page}</h3></div>',
+    )
+
+class TestCrawlCheckpoint:
+    """Test suite untuk CrawlCheckpoint dan mode resume"""
+
+    def test_save_and_load_roundtrip(self, tmp_path):
+        """Test records dan info pager tersimpan dan bisa dibaca kembali"""
+        checkpoint = CrawlCheckpoint(str(tmp_path / "crawl.sqlite"))
+        checkpoint.start(BASE_URL)
+        checkpoint.save(1, [{"Title": "A", "Price": "$1.00"}], PageInfo(3, True))
+
+        products, info = checkpoint.load(1)
+        records, _ = checkpoint.load(1, compact=True)
+
+        assert products[0]["Title"] == "A"
+        assert products[0]["Rating"] is None
+        assert records[0] == ProductRecord("A", "$1.00", None, None, None, None, None)
+        assert info == PageInfo(3, True)
+
+    def test_start_without_resume_discards_old_pages(self, tmp_path):
+        """Test start tanpa resume menghapus checkpoint lama"""
+        path = str(tmp_path / "crawl.sqlite")
+        checkpoint = CrawlCheckpoint(path)
+        checkpoint.start(BASE_URL)
+        checkpoint.save(1, [], PageInfo(None, None))
+
+        assert CrawlCheckpoint(path).start(BASE_URL, resume=True) == {1}
+        assert CrawlCheckpoint(path).start(BASE_URL, resume=False) == set()
+
+    @pytest.mark.parametrize("max_workers", [1, 3])
+    @patch('utils.extract.requests.Session.get')
+    def test_resume_fetches_only_missing_pages(self, mock_get, tmp_path, max_workers):
+        """Test crawl yang terputus dilanjutkan hanya untuk halaman yang belum selesai"""
+        mock_get.side_effect = _fake_get
+        path = str(tmp_path / "crawl.sqlite")
+
+        # Simulasikan crash setelah 2 halaman
+        pages = iter_pages(BASE_URL, 1, 5, delay=0, checkpoint=path)
+        next(pages)
+        next(pages)
+        next(pages, None)
+        pages.close()
+        assert CrawlCheckpoint(path).start(BASE_URL, resume=True) == {1, 2, 3}
+
+        mock_get.reset_mock()
+        products = scrape_products(BASE_URL, 1, 5, delay=0, max_workers=max_workers, checkpoint=path, resume=True)
+
+        assert [p["Title"] for p in products] == [f"Product {i}" for i in range(1, 6)]
+        assert sorted(call.args[0] for call in mock_get.call_args_list) == [BASE_URL.format(4), BASE_URL.format(5)]
+        # Checkpoint dihapus setelah crawl selesai
+        assert CrawlCheckpoint(path).start(BASE_URL, resume=True) == set()
@@ -1,7 +1,10 @@
 import pytest
 from bs4 import BeautifulSoup
 from unittest.mock import patch, MagicMock
-from utils.extract import extract_product_data, scrape_products
+from utils.extract import extract_product_data, scrape_products, iter_pages, iter_products, RateLimiter, parse_products, PARSER_BACKENDS
+from utils.extract import scrape_product_batch, detect_pagination, PaginationTracker, parse_products_fast
+from utils.records import ProductBatch, ProductRecord
+from utils.session import RetryPolicy, create_session, fetch_with_retry, parse_retry_after
 
 def test_extract_product_data_complete():
     html = '''
@@ -92,7 +95,7 @@ def test_extract_product_data_exception_handling():
     result = extract_product_data(mock_section)
     assert result is None, "Should return None on AttributeError"
 
-@patch('utils.extract.requests.get')
+@patch('utils.extract.requests.Session.get')
 def test_scrape_products_success(mock_get):
     """Test scraping products successfully"""
     # Mock successful response
@@ -114,7 +117,7 @@ def test_scrape_products_success(mock_get):
     assert len(products) > 0
     assert mock_get.called
 
-@patch('utils.extract.requests.get')
+@patch('utils.extract.requests.Session.get')
 def test_scrape_products_http_error(mock_get):
     """Test scraping with HTTP error response"""
     # Mock error response
@@ -128,8 +131,9 @@ def test_scrape_products_http_error(mock_get):
     assert len(products) == 0
     assert mock_get.called
 
-@patch('utils.extract.requests.get')
-def test_scrape_products_timeout(mock_get):
+@patch('utils.session.time.sleep')
+@patch('utils.extract.requests.Session.get')
+def test_scrape_products_timeout(mock_get, mock_sleep):
     """Test scraping with timeout error"""
     import requests
     mock_get.side_effect = requests.exceptions.Timeout("Connection timeout")
@@ -139,8 +143,9 @@ def test_scrape_products_timeout(mock_get):
     
     assert len(products) == 0
 
-@patch('utils.extract.requests.get')
-def test_scrape_products_connection_error(mock_get):
+@patch('utils.session.time.sleep')
+@patch('utils.extract.requests.Session.get')
+def test_scrape_products_connection_error(mock_get, mock_sleep):
     """Test scraping with connection error"""
     import requests
     mock_get.side_effect = requests.exceptions.ConnectionError("Connection failed")
@@ -149,8 +154,10 @@ def test_scrape_products_connection_error(mock_get):
     products = scrape_products(base_url, start_page=1, max_pages=1, delay=0)
     
     assert len(products) == 0
+    # 1 request awal + 3 retry default
+    assert mock_get.call_count == 4
 
-@patch('utils.extract.requests.get')
+@patch('utils.extract.requests.Session.get')
 def test_scrape_products_general_exception(mock_get):
     """Test scraping with general exception"""
     mock_get.side_effect = Exception("Unexpected error")
@@ -160,7 +167,7 @@ def test_scrape_products_general_exception(mock_get):
     
     assert len(products) == 0
 
-@patch('utils.extract.requests.get')
+@patch('utils.extract.requests.Session.get')
 def test_scrape_products_no_products_on_page(mock_get):
     """Test when page returns no products"""
     mock_response = MagicMock()
@@ -173,3 +180,417 @@ def test_scrape_products_no_products_on_page(mock_get):
     
     assert len(products) == 0
 
+@patch('utils.extract.requests.Session.get')
+def test_scrape_products_concurrent_keeps_page_order(mock_get):
+    """Test mode concurrent mengembalikan produk sesuai urutan halaman"""
+    import time
+
+    def fake_get(url, **kwargs):
+        page = int(url.rsplit('-', 1)[1].split('.')[0])
+        # Halaman awal dibuat lebih lambat agar selesai belakangan
+        time.sleep(0.01 * (5 - page))
+        response = MagicMock()
+        response.status_code = 200
+        response.content = f'''
+        <div class="product-details">
+            <h3 class="product-title">Product {page}</h3>
+            <span class="price">$10.00</span>
+        </div>
+        '''
+        return response
+
+    mock_get.side_effect = fake_get
+
+    base_url = "https://example.com/page-{}.html"
+    products = scrape_products(base_url, start_page=1, max_pages=4, max_workers=4)
+
+    assert [p['Title'] for p in products] == ["Product 1", "Product 2", "Product 3", "Product 4"]
+    assert mock_get.call_count == 4
+
+def test_rate_limiter_spaces_requests():
+    """Test RateLimiter membatasi jumlah request per detik"""
+    import time
+
+    limiter = RateLimiter(requests_per_second=50)
+    start = time.monotonic()
+    for _ in range(6):
+        limiter.wait()
+    elapsed = time.monotonic() - start
+
+    # 6 request pada 50 rps membutuhkan minimal 5 interval (0.1 detik)
+    assert elapsed >= 0.09
+
+def test_rate_limiter_without_limit_does_not_wait():
+    """Test RateLimiter tanpa batas tidak menunda request"""
+    import time
+
+    limiter = RateLimiter()
+    start = time.monotonic()
+    for _ in range(100):
+        limiter.wait()
+    assert time.monotonic() - start < 0.05
+
+@patch('utils.session.time.sleep')
+def test_fetch_with_retry_recovers_from_server_error(mock_sleep):
+    """Test fetch_with_retry mencoba ulang status 503 lalu berhasil"""
+    failed = MagicMock(status_code=503, headers={})
+    ok = MagicMock(status_code=200, headers={})
+    session = MagicMock()
+    session.get.side_effect = [failed, ok]
+
+    response = fetch_with_retry("https://example.com", session=session)
+
+    assert response is ok
+    assert session.get.call_count == 2
+    assert mock_sleep.call_count == 1
+
+@patch('utils.session.time.sleep')
+def test_fetch_with_retry_respects_retry_after(mock_sleep):
+    """Test header Retry-After dipakai sebagai jeda retry"""
+    throttled = MagicMock(status_code=429, headers={"Retry-After": "7"})
+    ok = MagicMock(status_code=200, headers={})
+    session = MagicMock()
+    session.get.side_effect = [throttled, ok]
+
+    fetch_with_retry("https://example.com", session=session)
+
+    mock_sleep.assert_called_once_with(7.0)
+
+@patch('utils.session.time.sleep')
+def test_fetch_with_retry_returns_last_response_when_exhausted(mock_sleep):
+    """Test response terakhir dikembalikan jika retry habis"""
+    failed = MagicMock(status_code=500, headers={})
+    session = MagicMock()
+    session.get.return_value = failed
+
+    response = fetch_with_retry("https://example.com", session=session, retry_policy=RetryPolicy(max_retries=2))
+
+    assert response.status_code == 500
+    assert session.get.call_count == 3
+
+def test_retry_policy_backoff_is_exponential_with_jitter():
+    """Test backoff bertambah eksponensial dan dibatasi max_backoff"""
+    policy = RetryPolicy(backoff_factor=1, max_backoff=5, jitter=0.5)
+    assert 1 <= policy.backoff(0) <= 1.5
+    assert 4 <= policy.backoff(2) <= 6
+    assert 5 <= policy.backoff(10) <= 7.5
+
+def test_parse_retry_after_formats():
+    """Test parsing Retry-After dalam detik maupun HTTP-date"""
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0.0
+    assert parse_retry_after("not-a-date") is None
+    assert parse_retry_after(None) is None
+
+def test_create_session_uses_pooling_and_compression():
+    """Test session memakai pool adapter dan header kompresi"""
+    session = create_session(pool_size=7)
+    adapter = session.get_adapter("https://example.com")
+
+    assert adapter._pool_maxsize == 7
+    assert "gzip" in session.headers["Accept-Encoding"]
+    assert "Mozilla" in session.headers["User-Agent"]
+
+SAMPLE_PAGE = '''
+<html><head><title>Fashion Studio</title></head><body>
+<div class="collection-grid">
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">T-shirt 1</h3>
+            <div class="price-container"><span class="price">$102.15</span></div>
+            <p style="font-size: 14px;">Rating: ⭐ 3.9 / 5</p>
+            <p style="font-size: 14px;">3 Colors</p>
+            <p style="font-size: 14px;">Size: M</p>
+            <p style="font-size: 14px;">Gender: Women</p>
+        </div>
+    </div>
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">Unknown Product</h3>
+            <p class="price">Price Unavailable</p>
+            <p>Rating: Invalid Rating / 5</p>
+            <p>5 Colors</p>
+            <p>Size: <b>XL</b></p>
+            <p>Gender: Men &amp; Women</p>
+        </div>
+    </div>
+    <div class="collection-card">
+        <div class="product-details">
+            <h3 class="product-title">  Pants   2 </h3>
+            <span class="price">$7.50</span>
+            <p>Rating: Not Rated</p>
+        </div>
+    </div>
+    <div class="promo"><p>Rating: not a product</p></div>
+</div>
+</body></html>
+'''
+
+def _without_timestamp(products):
+    return [{k: v for k, v in product.items() if k != 'Timestamp'} for product in products]
+
+@pytest.mark.parametrize("parser", PARSER_BACKENDS)
+def test_parse_products_backends_parity(parser):
+    """Test semua parser backend menghasilkan record yang identik"""
+    expected_count, expected = parse_products(SAMPLE_PAGE, "html.parser")
+    count, products = parse_products(SAMPLE_PAGE.encode("utf-8"), parser)
+
+    assert expected_count == count == 3
+    assert _without_timestamp(products) == _without_timestamp(expected)
+    assert products[1]['Gender'] == "Men & Women"
+    assert products[1]['Price'] is None
+
+MULTI_CLASS_PAGE = '''
+<div class="collection-grid">
+    <div class="big product-details"><h3 class="product-title">Hoodie 1</h3>
+        <div class="price-container"><span class="price">$10.00</span></div><p>Rating: ⭐ 4.0 / 5</p></div>
+    <div class="product-details other"><h3 class="product-title">Hoodie 2</h3>
+        <div class="price-container"><span class="price">$20.00</span></div><p>Rating: ⭐ 3.0 / 5</p></div>
+    <div class="product-details-extra"><h3 class="product-title">Not a product</h3></div>
+</div>
+'''
+
+@pytest.mark.parametrize("parser", PARSER_BACKENDS)
+def test_parse_products_backends_parity_multi_class(parser):
+    """Test div product-details dengan class tambahan ditemukan oleh semua backend"""
+    expected_count, expected = parse_products(MULTI_CLASS_PAGE, "html.parser")
+    count, products = parse_products(MULTI_CLASS_PAGE.encode("utf-8"), parser)
+
+    assert expected_count == count == 2
+    assert _without_timestamp(products) == _without_timestamp(expected)
+    assert [p['Title'] for p in products] == ["Hoodie 1", "Hoodie 2"]
+
+def test_parse_products_unknown_backend():
+    """Test nama parser yang tidak dikenal ditolak"""
+    with pytest.raises(ValueError):
+        parse_products(SAMPLE_PAGE, "regex")
+
+@patch('utils.extract.LexborHTMLParser', None)
+def test_parse_products_missing_backend_falls_back():
+    """Test backend yang tidak terinstall fallback ke strainer"""
+    count, products = parse_products(SAMPLE_PAGE, "selectolax")
+    assert count == 3
+    assert products[0]['Title'] == "T-shirt 1"
+
+def _page_response(url, **kwargs):
+    page = int(url.rsplit('-', 1)[1].split('.')[0])
+    response = MagicMock()
+    response.status_code = 200
+    response.content = f'''
+    <div class="product-details"><h3 class="product-title">Product {page}A</h3></div>
+    <div class="product-details"><h3 class="product-title">Product {page}B</h3></div>
+    '''
+    return response
+
+@patch('utils.extract.requests.Session.get')
+def test_iter_pages_yields_each_page_lazily(mock_get):
+    """Test iter_pages menghasilkan halaman satu per satu tanpa menunggu crawl selesai"""
+    mock_get.side_effect = _page_response
+
+    pages = iter_pages("https://example.com/page-{}.html", start_page=1, max_pages=3, delay=0)
+    page, products = next(pages)
+
+    assert page == 1
+    assert [p['Title'] for p in products] == ["Product 1A", "Product 1B"]
+    assert mock_get.call_count == 1
+    assert [page for page, _ in pages] == [2, 3]
+
+@patch('utils.extract.requests.Session.get')
+def test_iter_products_concurrent_matches_scrape_products(mock_get):
+    """Test iter_products concurrent menghasilkan urutan yang sama dengan scrape_products"""
+    mock_get.side_effect = _page_response
+    base_url = "https://example.com/page-{}.html"
+
+    streamed = [p['Title'] for p in iter_products(base_url, 1, 5, delay=0, max_workers=3)]
+    collected = [p['Title'] for p in scrape_products(base_url, 1, 5, delay=0)]
+
+    assert streamed == collected
+    assert len(streamed) == 10
+
+@patch('utils.extract.requests.Session.get')
+def test_scrape_products_parse_workers_matches_sequential(mock_get):
+    """Test parsing di process pool menghasilkan produk dan urutan yang sama"""
+    mock_get.side_effect = _page_response
+    base_url = "https://example.com/page-{}.html"
+
+    pooled = scrape_products(base_url, 1, 6, delay=0, max_workers=3, parse_workers=2)
+    sequential = scrape_products(base_url, 1, 6, delay=0)
+
+    assert [p['Title'] for p in pooled] == [p['Title'] for p in sequential]
+    assert len(pooled) == 12
+
+@patch('utils.extract.requests.Session.get')
+def test_scrape_products_parse_workers_skips_failed_pages(mock_get):
+    """Test halaman yang gagal diambil dilewati pada mode process pool"""
+    def fake_get(url, **kwargs):
+        if url.endswith("page-2.html"):
+            return MagicMock(status_code=500, headers={})
+        return _page_response(url)
+
+    mock_get.side_effect = fake_get
+    base_url = "https://example.com/page-{}.html"
+
+    with patch('utils.session.time.sleep'):
+        products = scrape_products(base_url, 1, 3, parse_workers=2)
+
+    assert [p['Title'] for p in products] == ["Product 1A", "Product 1B", "Product 3A", "Product 3B"]
+
+def test_parse_products_compact_records_share_page_timestamp():
+    """Test mode compact menghasilkan ProductRecord dengan satu timestamp per halaman"""
+    _, records = parse_products(SAMPLE_PAGE, compact=True)
+    _, dicts = parse_products(SAMPLE_PAGE)
+
+    assert all(isinstance(record, ProductRecord) for record in records)
+    assert [record._asdict() for record in records][0]['Title'] == dicts[0]['Title']
+    assert len({record.Timestamp for record in records}) == 1
+    assert records[0].Timestamp is records[-1].Timestamp
+
+def test_product_batch_builds_columns():
+    """Test ProductBatch menyimpan data per kolom dan membangun DataFrame"""
+    batch = ProductBatch()
+    batch.append(ProductRecord("A", "$1.00", "⭐4.0 / 5", "3", "M", "Men", "2024-01-01 10:00:00"))
+    batch.append({"Title": "B", "Price": "$2.00"})
+
+    df = batch.to_dataframe()
+
+    assert len(batch) == 2
+    assert list(df.columns) == ["Title", "Price", "Rating", "Color", "Size", "Gender", "Timestamp"]
+    assert df['Title'].tolist() == ["A", "B"]
+    assert df['Rating'].iloc[1] is None
+    assert list(batch)[0].Title == "A"
+
+@patch('utils.extract.requests.Session.get')
+def test_scrape_product_batch(mock_get):
+    """Test scrape_product_batch mengumpulkan produk ke ProductBatch"""
+    mock_get.side_effect = _page_response
+
+    batch = scrape_product_batch("https://example.com/page-{}.html", 1, 2, delay=0)
+
+    assert isinstance(batch, ProductBatch)
+    assert batch.columns['Title'] == ["Product 1A", "Product 1B", "Product 2A", "Product 2B"]
+
+PAGER_HTML = '''
+<div class="product-details"><h3 class="product-title">Product {page}</h3></div>
+<ul class="pagination">
+    <li class="page-item current"><span class="page-link">Page {page} of {total}</span></li>
+    {next_item}
+</ul>
+'''
+
+def _pager_response(total):
+    def fake_get(url, **kwargs):
+        page = int(url.rsplit('-', 1)[1].split('.')[0])
+        next_item = '<li class="page-item next"><a class="page-link" href="#">Next</a></li>' if page < total else ''
+        content = PAGER_HTML.format(page=page, total=total, next_item=next_item) if page <= total else '<html></html>'
+        return MagicMock(status_code=200, content=content)
+    return fake_get
+
+def test_detect_pagination():
+    """Test pembacaan pager: total halaman dan link Next"""
+    next_item = '<li class="page-item next"><a class="page-link" href="#">Next</a></li>'
+    assert detect_pagination(PAGER_HTML.format(page=1, total=3, next_item=next_item)) == (3, True)
+    assert detect_pagination(PAGER_HTML.format(page=3, total=3, next_item='')) == (3, False)
+    disabled = '<li class="page-item next disabled"><span>Next</span></li>'
+    assert detect_pagination(PAGER_HTML.format(page=3, total=3, next_item=disabled)).has_next is False
+    assert detect_pagination('<html><body>No pager</body></html>') == (None, None)
+
+@patch('utils.extract.requests.Session.get')
+def test_scrape_products_stops_at_last_page(mock_get):
+    """Test crawl berhenti di halaman terakhir menurut pager"""
+    mock_get.side_effect = _pager_response(total=3)
+
+    products = scrape_products("https://example.com/page-{}.html", 1, 50, delay=0)
+
+    assert [p['Title'] for p in products] == ["Product 1", "Product 2", "Product 3"]
+    assert mock_get.call_count == 3
+
+@patch('utils.extract.requests.Session.get')
+def test_scrape_products_concurrent_uses_exact_work_list(mock_get):
+    """Test mode concurrent hanya mengambil halaman sampai total dari pager"""
+    mock_get.side_effect = _pager_response(total=5)
+
+    products = scrape_products("https://example.com/page-{}.html", 1, 50, max_workers=4)
+
+    assert len(products) == 5
+    assert mock_get.call_count == 5
+
+@patch('utils.extract.requests.Session.get')
+def test_scrape_products_stops_after_consecutive_empty_pages(mock_get):
+    """Test crawl tanpa pager berhenti setelah N halaman kosong berturut-turut"""
+    def fake_get(url, **kwargs):
+        page = int(url.rsplit('-', 1)[1].split('.')[0])
+        if page <= 2:
+            return _page_response(url)
+        return MagicMock(status_code=200, content='<html><body>No products</body></html>')
+
+    mock_get.side_effect = fake_get
+
+    products = scrape_products("https://example.com/page-{}.html", 1, None, delay=0, max_empty_pages=2)
+
+    assert len(products) == 4
+    assert mock_get.call_count == 4
+
+def test_pagination_tracker_requires_bound():
+    """Test max_pages=None tanpa max_empty_pages ditolak"""
+    with pytest.raises(ValueError):
+        PaginationTracker(1, None, None)
+
+def _random_page(seed):
+    """Halaman sampel dengan variasi markup yang masih reguler"""
+    import random
+    rng = random.Random(seed)
+    cards = []
+    for i in range(rng.randint(0, 8)):
+        title = rng.choice([f"T-shirt {i}", f"  Pants &amp; Co {i} ", f"<b>Bold</b> Jacket {i}", "Unknown Product"])
+        lines = [
+            f'<div class="price-container"><span class="price">${rng.uniform(1, 500):.2f}</span></div>',
+            '<p class="price">Price Unavailable</p>',
+            f'<p style="font-size: 14px;">Rating: ⭐ {rng.uniform(1, 5):.1f} / 5</p>',
+            '<p>Rating: Invalid Rating / 5</p>',
+            f'<p>{rng.randint(1, 8)} Colors</p>',
+            f'<p>Size: <em>{rng.choice(["S", "M", "XL"])}</em></p>',
+            f'<p>Gender:&nbsp;{rng.choice(["Men", "Women", "Unisex"])}</p>',
+            '<p></p>',
+        ]
+        body = "\n".join(rng.sample(lines, rng.randint(0, len(lines))))
+        extra = rng.choice(["", " card", " highlighted"])
+        cards.append(
+            f'<div class="collection-card"><div class="product-details{extra}">'
+            f'<h3 class="product-title">{title}</h3>\n{body}</div></div>'
+        )
+    return f"<html><body><div class='grid'>{''.join(cards)}</div></body></html>"
+
+@pytest.mark.parametrize("seed", range(30))
+def test_fast_path_matches_beautifulsoup(seed):
+    """Test differential: fast path menghasilkan record yang identik dengan jalur BeautifulSoup"""
+    page = _random_page(seed)
+    fast = parse_products_fast(page.encode("utf-8"), timestamp="2024-01-01 10:00:00")
+    expected = parse_products(page, "html.parser", timestamp="2024-01-01 10:00:00")
+
+    assert fast is not None, "Halaman reguler seharusnya lolos sanity check"
+    assert fast == expected
+
+def test_fast_path_matches_sample_page():
+    """Test fast path pada halaman sampel lengkap"""
+    assert parse_products_fast(SAMPLE_PAGE, "ts") == parse_products(SAMPLE_PAGE, "html.parser", "ts")
+
+@pytest.mark.parametrize("markup", [
+    '<div class="product-details"><!-- <h3 class="product-title">Hidden</h3> --><h3 class="product-title">A</h3></div>',
+    '<div class="product-details"><h3 class="product-title">A</h3><p>Size: <p>M</p></div>',
+    '<div class="product-details"><h3 class=product-title>A</h3></div>',
+    '<div class="product-details"><h3 class = "product-title">A</h3></div>',
+    '<div class="product-details"><h3 class= "product-title">A</h3></div>',
+    '<div class="product-details"><div class="product-details"><h3 class="product-title">A</h3></div></div>',
+    '<div class="product-details"><span class="price"><span>$</span>1</span></div>',
+    '<div class="product-details"><h3 class="product-title">Unclosed',
+    "<div class='product-details'><h3 class=\"product-title\">A</h3></div>",
+    '<div class="product-details"><h3 class="product-title">A</h3></div>'
+    "<div class='product-details'><h3 class=\"product-title\">B</h3></div>",
+    '<div class="product-details"><h3 class="product-title" data-x="a>b">T</h3></div>',
+    '<div class="product-details" data-x="a>b"><h3 class="product-title">T</h3></div>',
+])
+def test_fast_path_falls_back_on_irregular_markup(markup):
+    """Test halaman yang gagal sanity check otomatis memakai jalur BeautifulSoup"""
+    assert parse_products_fast(markup) is None
+    assert parse_products(markup, "fast", "ts") == parse_products(markup, "strainer", "ts")
+    assert parse_products(markup, "fast", "ts") == parse_products(markup, "html.parser", "ts")
@@ -0,0 +1,96 @@
+import numpy as np
+import pandas as pd
+from utils.fingerprints import FingerprintStore
+from utils.load import dispose_engines, load_to_db
+from utils.transform import deduplicate_products, product_fingerprints, record_fingerprints
+
+def _products():
+    return pd.DataFrame({
+        "Title": ["Product A", "Product A", "Product B", "Product A"],
+        "Price": [800000, 800000, 960000, 800000],
+        "Rating": [4.5, 4.5, 3.2, 4.8],
+        "Color": ["Red", "Red", "Blue", "Red"],
+        "Size": ["M", "M", "L", "L"],
+        "Gender": ["Men", "Men", "Women", "Men"],
+        "Timestamp": ["2024-01-01 10:00:00"] * 4,
+    })
+
+class TestFingerprintStore:
+    """Test suite untuk FingerprintStore"""
+
+    def test_add_and_contains(self, tmp_path):
+        """Test hash uint64 (termasuk di atas int64 max) tersimpan dan dikenali"""
+        store = FingerprintStore(str(tmp_path / "fp.sqlite"))
+        hashes = np.array([1, 2**63 + 5, 2**64 - 1], dtype=np.uint64)
+
+        assert store.add(hashes) == 3
+        assert store.add(hashes[:1]) == 0
+        assert store.contains(np.array([2**64 - 1, 7], dtype=np.uint64)).tolist() == [True, False]
+        assert len(store) == 3
+
+    def test_persists_across_instances(self, tmp_path):
+        """Test fingerprint tetap ada setelah store dibuka ulang"""
+        path = str(tmp_path / "fp.sqlite")
+        store = FingerprintStore(path)
+        store.add([42])
+        store.close()
+
+        assert FingerprintStore(path).contains([42]).tolist() == [True]
+
+class TestDeduplicateProducts:
+    """Test suite untuk deduplicate_products"""
+
+    def test_removes_in_run_duplicates(self):
+        """Test duplikat natural key dalam satu run dihapus (Rating tidak termasuk key)"""
+        df = deduplicate_products(_products())
+
+        assert df["Title"].tolist() == ["Product A", "Product B", "Product A"]
+        assert df["Size"].tolist() == ["M", "L", "L"]
+
+    def test_skips_products_from_previous_runs(self, tmp_path):
+        """Test produk yang sudah dimuat di run sebelumnya dilewati"""
+        store = FingerprintStore(str(tmp_path / "fp.sqlite"))
+
+        first = deduplicate_products(_products(), store)
+        second = deduplicate_products(_products(), store)
+
+        assert len(first) == 3
+        assert second.empty
+        assert len(store) == 3
+
+    def test_record_false_does_not_store(self, tmp_path):
+        """Test record=False hanya memeriksa tanpa menyimpan fingerprint"""
+        store = FingerprintStore(str(tmp_path / "fp.sqlite"))
+
+        deduplicate_products(_products(), store, record=False)
+
+        assert len(store) == 0
+
+    def test_failed_load_does_not_record(self, tmp_path):
+        """Test fingerprint hanya dicatat setelah load ke database berhasil"""
+        store = FingerprintStore(str(tmp_path / "fp.sqlite"))
+        new_products = deduplicate_products(_products(), store, record=False)
+
+        # Direktori database tidak ada sehingga load gagal
+        if load_to_db(new_products, f"sqlite:///{tmp_path / 'missing' / 'db.sqlite'}") is not None:
+            record_fingerprints(new_products, store)
+        assert len(store) == 0
+
+        if load_to_db(new_products, f"sqlite:///{tmp_path / 'db.sqlite'}") is not None:
+            record_fingerprints(new_products, store)
+        dispose_engines()
+        assert len(store) == 3
+        assert deduplicate_products(_products(), store).empty
+
+    def test_fingerprint_matches_compact_schema(self):
+        """Test fingerprint sama untuk kolom category/int32"""
+        df = _products()
+        compact = df.astype({"Color": "category", "Size": "category", "Gender": "category", "Price": "int32"})
+
+        assert product_fingerprints(df).tolist() == product_fingerprints(compact).tolist()
+
+    def test_missing_key_column_returns_input(self):
+        """Test kolom key yang hilang tidak menghapus data"""
+        df = _products().drop(columns=["Color"])
+
+        assert len(deduplicate_products(df)) == 4
@@ -0,0 +1,207 @@
+import threading
+import time
+from collections import deque
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+import requests
+from unittest.mock import MagicMock
+from utils.extract import scrape_products
+from utils.session import AdaptiveRateController, RequestHedger, RetryPolicy, fetch_with_retry
+
+class ThrottlingHandler(BaseHTTPRequestHandler):
+    """Stand-in server: membalas 429 jika request per detik melebihi batas"""
+
+    def do_GET(self):
+        server = self.server
+        with server.lock:
+            now = time.monotonic()
+            while server.recent and now - server.recent[0] > 1.0:
+                server.recent.popleft()
+            throttled = len(server.recent) >= server.limit
+            if throttled:
+                server.throttled += 1
+            else:
+                server.recent.append(now)
+                server.served += 1
+        if throttled:
+            self.send_response(429)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        body = b'<div class="product-details"><h3 class="product-title">Product</h3></div>'
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+@pytest.fixture
+def throttling_server():
+    server = ThreadingHTTPServer(("127.0.0.1", 0), ThrottlingHandler)
+    server.daemon_threads = True
+    server.lock = threading.Lock()
+    server.recent = deque()
+    server.limit = 25
+    server.served = server.throttled = 0
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server, f"http://127.0.0.1:{server.server_address[1]}/?page={{}}"
+    server.shutdown()
+
+def _response(status_code):
+    return MagicMock(status_code=status_code)
+
+class TestAdaptiveRateController:
+    """Test suite untuk AdaptiveRateController (AIMD)"""
+
+    def test_throttle_halves_rate_within_bounds(self):
+        """Test 429/503 dan timeout menurunkan rate secara multiplikatif sampai batas bawah"""
+        controller = AdaptiveRateController(initial_rate=8, min_rate=1.5, initial_concurrency=8, cooldown=0)
+
+        controller.wait()
+        controller.record(0.1, _response(429))
+        assert controller.rate == 4
+        assert int(controller.concurrency) == 4
+
+        controller.wait()
+        controller.record(0.1, error=requests.exceptions.Timeout())
+        controller.wait()
+        controller.record(0.1, _response(503))
+        assert controller.rate == 1.5
+        assert controller.decreases == 3
+
+    def test_success_increases_rate_up_to_ceiling(self):
+        """Test respons sukses dengan latency stabil menaikkan rate sampai batas atas"""
+        controller = AdaptiveRateController(initial_rate=1, max_rate=3, max_concurrency=4, increase=1)
+
+        for _ in range(50):
+            controller.record(0.05, _response(200))
+
+        assert controller.rate == 3
+        assert int(controller.concurrency) == 4
+        assert controller.decreases == 0
+
+    def test_rising_p95_latency_triggers_backoff(self):
+        """Test kenaikan p95 latency di atas toleransi menurunkan rate"""
+        controller = AdaptiveRateController(initial_rate=10, max_rate=10, min_samples=5, latency_window=5)
+
+        for _ in range(5):
+            controller.record(0.05, _response(200))
+        assert controller.baseline_p95 == pytest.approx(0.05)
+
+        for _ in range(5):
+            controller.record(0.5, _response(200))
+
+        assert controller.decreases == 1
+        assert controller.rate < 6
+
+    def test_converges_against_throttling_server(self, throttling_server):
+        """Test controller menyesuaikan diri dengan server yang membatasi 25 req/detik"""
+        server, base_url = throttling_server
+        controller = AdaptiveRateController(
+            initial_rate=5, max_rate=200, increase=40, initial_concurrency=2, max_concurrency=8, cooldown=0.3,
+        )
+        retry_policy = RetryPolicy(max_retries=10, backoff_factor=0.05, max_backoff=0.5)
+
+        products = scrape_products(base_url, 1, 80, max_workers=8, rate_limiter=controller,
+                                   retry_policy=retry_policy, max_empty_pages=None)
+
+        assert len(products) == 80
+        assert controller.decreases >= 1
+        assert controller.min_rate <= controller.rate <= controller.max_rate
+        # Sebagian besar request tetap dilayani setelah controller mundur
+        assert server.throttled < server.served
+
+def _slow_first_session(slow=1.0):
+    """Session palsu: request pertama lambat, duplikatnya cepat"""
+    calls = []
+    lock = threading.Lock()
+
+    def get(url, **kwargs):
+        with lock:
+            calls.append(url)
+            first = len(calls) == 1
+        if first:
+            time.sleep(slow)
+            return _response(200)
+        return MagicMock(status_code=200, hedged=True)
+
+    session = MagicMock()
+    session.get.side_effect = get
+    return session, calls
+
+class TestRequestHedger:
+    """Test suite untuk RequestHedger"""
+
+    def _warmed_hedger(self, **kwargs):
+        hedger = RequestHedger(min_samples=5, min_delay=0.01, **kwargs)
+        hedger.latencies = {f"warmup-{i}": 0.02 for i in range(20)}
+        hedger.requests = 20
+        return hedger
+
+    def test_slow_request_is_hedged(self):
+        """Test request yang melewati persentil latency diduplikasi dan duplikat tercepat dipakai"""
+        hedger = self._warmed_hedger()
+        session, calls = _slow_first_session()
+
+        start = time.monotonic()
+        response = fetch_with_retry("https://example.com/slow", session=session, hedger=hedger)
+
+        assert time.monotonic() - start < 0.5
+        assert response.hedged is True
+        assert len(calls) == 2
+        assert hedger.report()["hedges"] == hedger.report()["hedge_wins"] == 1
+        hedger.close()
+
+    def test_no_hedge_without_enough_samples(self):
+        """Test tidak ada hedging sebelum latency cukup teramati"""
+        hedger = RequestHedger(min_samples=5)
+        session, calls = _slow_first_session(slow=0.1)
+
+        hedger.get(session, "https://example.com/1")
+
+        assert len(calls) == 1
+        assert hedger.hedges == 0
+        hedger.close()
+
+    def test_extra_load_is_capped(self):
+        """Test jumlah hedge dibatasi max_extra_ratio"""
+        hedger = self._warmed_hedger(max_extra_ratio=0)
+        session, calls = _slow_first_session(slow=0.1)
+
+        hedger.get(session, "https://example.com/1")
+
+        assert len(calls) == 1
+        assert hedger.hedges == 0
+        hedger.close()
+
+    def test_failed_primary_uses_successful_hedge(self):
+        """Test exception pada request utama tidak menggagalkan jika duplikat berhasil"""
+        hedger = self._warmed_hedger()
+        session = MagicMock()
+
+        def get(url, **kwargs):
+            if session.get.call_count == 1:
+                time.sleep(0.1)
+                raise requests.exceptions.ConnectionError("boom")
+            return _response(200)
+
+        session.get.side_effect = get
+
+        assert hedger.get(session, "https://example.com/1").status_code == 200
+        hedger.close()
+
+    def test_report_percentiles(self):
+        """Test laporan p50/p95/p99 dari latency per halaman"""
+        hedger = RequestHedger()
+        hedger.latencies = {f"page-{i}": i / 100 for i in range(1, 101)}
+
+        report = hedger.report()
+
+        assert report["pages"] == 100
+        assert report["p50"] == pytest.approx(0.51, abs=0.01)
+        assert report["p95"] == pytest.approx(0.95, abs=0.01)
+        assert report["p99"] == pytest.approx(0.99, abs=0.01)
+        hedger.close()
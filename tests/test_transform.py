@@ -1,7 +1,14 @@
 import pytest
 import pandas as pd
 import numpy as np
-from utils.transform import transform_product_data, remove_invalid_products
+from unittest.mock import patch
+from utils.load import load_to_csv
+from utils.records import ProductBatch
+from utils.transform import (
+    transform_product_data, remove_invalid_products, iter_record_chunks,
+    iter_transform_product_data, iter_remove_invalid_products, validate_products,
+    ValidationRule, VALIDATION_RULES, transform_product_data_parallel, resolve_engine, pa, pl
+)
 
 class TestTransformProductData:
     """Test suite untuk fungsi transform_product_data"""
@@ -167,6 +174,44 @@ class TestTransformProductData:
         df = transform_product_data(raw_data)
         assert df.empty, "Should filter out products with invalid rating"
 
+    def test_transform_accepts_compact_records(self):
+        """Test transformasi dari ProductRecord dan ProductBatch sama dengan dari dict"""
+        from utils.records import ProductBatch, ProductRecord
+
+        raw_data = [
+            {"Title": "T-shirt", "Price": "$50.00", "Rating": "⭐4.5 / 5", "Color": "3",
+             "Size": "M", "Gender": "Men", "Timestamp": "2024-01-01 10:00:00"},
+            {"Title": "Unknown Product", "Price": "$10.00", "Rating": "⭐4.0 / 5", "Color": "2",
+             "Size": "L", "Gender": "Women", "Timestamp": "2024-01-01 10:00:00"},
+        ]
+        records = [ProductRecord(**row) for row in raw_data]
+
+        expected = transform_product_data(raw_data)
+
+        pd.testing.assert_frame_equal(transform_product_data(records), expected)
+        pd.testing.assert_frame_equal(transform_product_data(ProductBatch(records)), expected)
+
+    def test_transform_single_pass_output(self):
+        """Test output pipeline vektor: baris valid, tipe kolom dan index"""
+        base = {"Color": "3", "Size": "M", "Gender": "Men", "Timestamp": "2024-01-01 10:00:00"}
+        raw_data = [
+            dict(base, Title="A", Price="$10.00", Rating="⭐4.5 / 5"),
+            dict(base, Title=None, Price="$10.00", Rating="⭐4.5 / 5"),
+            dict(base, Title="B", Price="Price Unavailable", Rating="⭐4.0 / 5"),
+            dict(base, Title="C", Price="$2.50", Rating="Not Rated"),
+            dict(base, Title="D", Price="$1.00", Rating="⭐ . / "),
+            dict(base, Title="E", Price="$3.00", Rating="⭐3.9 / 5"),
+        ]
+
+        df = transform_product_data(raw_data)
+
+        assert df['Title'].tolist() == ["A", "E"]
+        assert df['Price'].tolist() == [160000, 48000]
+        assert df['Rating'].tolist() == [4.5, 3.9]
+        assert df['Price'].dtype == np.int64
+        assert df['Rating'].dtype == np.float64
+        assert df.index.tolist() == [0, 1]
+
 class TestRemoveInvalidProducts:
     """Test suite untuk fungsi remove_invalid_products"""
 
@@ -273,6 +318,38 @@ class TestRemoveInvalidProducts:
         # Should successfully remove products
         assert len(result_df) == 1
 
+    def test_remove_keeps_original_filter_semantics(self):
+        """Test Title None dan Rating yang hanya mengandung 'Invalid' tidak dihapus (filter asli)"""
+        df = pd.DataFrame({
+            "Title": [None, "Product B", "Product C", "Product D"],
+            "Price": ["$50.00", "$60.00", "$70.00", "$80.00"],
+            "Rating": [4.5, "Invalid Rating / 5", "Invalid Rating/5", "Not Rated"],
+        })
+
+        result_df = remove_invalid_products(df)
+
+        assert result_df["Title"].tolist() == [None, "Product B"]
+        assert len(remove_invalid_products(df, rules=VALIDATION_RULES)) == 0
+
+    @pytest.mark.parametrize("seed", range(20))
+    def test_remove_matches_original_filter(self, seed):
+        """Test differential terhadap filter remove_invalid_products sebelum rule engine"""
+        rng = np.random.default_rng(seed)
+        size = 50
+        df = pd.DataFrame({
+            "Title": rng.choice(np.array(["Product A", "Unknown Product", None], dtype=object), size),
+            "Price": rng.choice(np.array(["$50.00", "Price Unavailable", None, 60.0], dtype=object), size),
+            "Rating": rng.choice(np.array([4.5, np.nan, "Invalid Rating/5", "Invalid Rating / 5", "Not Rated"],
+                                          dtype=object), size),
+        })
+
+        expected = df[df['Title'] != 'Unknown Product']
+        expected = expected[~expected['Price'].isin(['Price Unavailable', None])]
+        expected = expected[~expected['Rating'].isin(['Invalid Rating/5', 'Not Rated'])]
+        expected = expected[expected['Rating'].notna()].reset_index(drop=True)
+
+        pd.testing.assert_frame_equal(remove_invalid_products(df), expected)
+
     def test_remove_all_invalid_products(self):
         """Test removing when all products are invalid"""
         df = pd.DataFrame({
@@ -449,3 +526,313 @@ class TestRemoveInvalidProducts:
         # Should handle exception and return empty DataFrame or processed data
         assert isinstance(result_df, pd.DataFrame)
 
+
+
+class TestCompactSchema:
+    """Test suite untuk mode compact_schema"""
+
+    def _raw_data(self, rows=200):
+        colors = ["Red", "Blue", "Green"]
+        return [
+            {
+                "Title": f"Product {i}",
+                "Price": f"${10 + i % 50}.00",
+                "Rating": f"⭐{3 + (i % 20) / 10} / 5",
+                "Color": colors[i % 3],
+                "Size": "M" if i % 2 else "L",
+                "Gender": "Men" if i % 2 else "Women",
+                "Timestamp": "2024-01-01 10:00:00"
+            }
+            for i in range(rows)
+        ]
+
+    def test_compact_schema_dtypes(self):
+        """Test kolom dikonversi ke category/int32/float32/datetime"""
+        df = transform_product_data(self._raw_data(), compact_schema=True)
+
+        for column in ("Color", "Size", "Gender"):
+            assert isinstance(df[column].dtype, pd.CategoricalDtype)
+        assert df['Price'].dtype == 'int32'
+        assert df['Rating'].dtype == 'float32'
+        assert pd.api.types.is_datetime64_any_dtype(df['Timestamp'])
+
+    def test_compact_schema_reduces_memory(self):
+        """Test memori berkurang dan penghematan dicatat di attrs"""
+        plain = transform_product_data(self._raw_data())
+        compact = transform_product_data(self._raw_data(), compact_schema=True)
+
+        usage = compact.attrs['memory_usage']
+        assert usage['after'] < usage['before']
+        assert compact.memory_usage(deep=True).sum() < plain.memory_usage(deep=True).sum()
+
+    def test_compact_schema_keeps_unparseable_timestamps(self):
+        """Test Timestamp dengan format lain tidak diubah menjadi NaT"""
+        raw_data = self._raw_data(3)
+        raw_data[0]["Timestamp"] = "2024-01-01"
+
+        df = transform_product_data(raw_data, compact_schema=True)
+
+        assert df['Timestamp'].tolist()[0] == "2024-01-01"
+
+    def test_default_schema_unchanged(self):
+        """Test tanpa compact_schema tipe kolom tetap seperti semula"""
+        df = transform_product_data(self._raw_data(3))
+
+        assert df['Color'].dtype == object
+        assert df['Rating'].dtype == 'float64'
+        assert df['Timestamp'].dtype == object
+
+
+class TestStreamingTransform:
+    """Test suite untuk transformasi bertahap (chunked)"""
+
+    def _raw_data(self, rows=25):
+        raw_data = [
+            {
+                "Title": f"Product {i}",
+                "Price": f"${10 + i}.00",
+                "Rating": f"⭐{3 + (i % 20) / 10} / 5",
+                "Color": "Red",
+                "Size": "M",
+                "Gender": "Men",
+                "Timestamp": "2024-01-01 10:00:00"
+            }
+            for i in range(rows)
+        ]
+        raw_data[3]["Title"] = "Unknown Product"
+        raw_data[7]["Price"] = "Price Unavailable"
+        raw_data[12]["Rating"] = "Invalid Rating / 5"
+        return raw_data
+
+    def test_iter_record_chunks(self):
+        """Test produk dikelompokkan sesuai chunk_size"""
+        chunks = list(iter_record_chunks(range(7), chunk_size=3))
+
+        assert chunks == [[0, 1, 2], [3, 4, 5], [6]]
+
+    def test_chunked_matches_full_transform(self):
+        """Test gabungan hasil per chunk sama dengan transformasi penuh"""
+        raw_data = self._raw_data()
+        expected = remove_invalid_products(transform_product_data(raw_data))
+
+        chunks = list(iter_remove_invalid_products(
+            iter_transform_product_data(iter_record_chunks(iter(raw_data), chunk_size=4))
+        ))
+
+        assert all(len(chunk) <= 4 for chunk in chunks)
+        pd.testing.assert_frame_equal(pd.concat(chunks, ignore_index=True), expected)
+
+    def test_chunked_skips_empty_batches(self):
+        """Test batch kosong atau yang seluruhnya invalid tidak menghasilkan chunk"""
+        raw_data = self._raw_data()
+        invalid = [raw_data[3], raw_data[7]]
+
+        chunks = list(iter_transform_product_data([[], invalid, raw_data[:2]]))
+
+        assert len(chunks) == 1
+        assert len(chunks[0]) == 2
+
+
+class TestValidationRules:
+    """Test suite untuk rule engine validasi"""
+
+    def _df(self):
+        return pd.DataFrame({
+            "Title": ["Product A", "Unknown Product", "Product C", "Product D", None],
+            "Price": ["$50.00", "$60.00", "Price Unavailable", "$70.00", "$80.00"],
+            "Rating": ["⭐4.5 / 5", "⭐3.0 / 5", "⭐4.0 / 5", "⭐ Invalid Rating / 5", "⭐4.1 / 5"],
+        })
+
+    def test_single_mask_and_counts(self):
+        """Test semua aturan digabung menjadi satu mask dengan jumlah per aturan"""
+        result = validate_products(self._df())
+
+        assert result.mask.tolist() == [True, False, False, False, False]
+        assert result.counts == {
+            "missing_title": 1, "unknown_title": 1, "price_unavailable": 1,
+            "invalid_rating": 1, "missing_rating": 0,
+        }
+        assert result.rejected is None
+
+    def test_parsed_values_used_for_parsed_rules(self):
+        """Test aturan parsed=True memakai Series hasil parse"""
+        df = self._df()
+        parsed = pd.Series([4.5, 3.0, 4.0, 5.0, np.nan])
+
+        result = validate_products(df, parsed={"Rating": parsed})
+
+        assert result.counts["missing_rating"] == 1
+
+    def test_quarantine_receives_rejected_rows(self):
+        """Test baris yang ditolak dikirim ke quarantine sink"""
+        sink = []
+
+        result = validate_products(self._df(), quarantine=sink.append)
+
+        assert len(sink) == 1
+        assert sink[0].index.tolist() == [1, 2, 3, 4]
+        assert result.rejected is sink[0]
+
+    def test_failing_rule_skipped_unless_strict(self):
+        """Test aturan yang error dilewati, atau dilempar jika strict"""
+        df = self._df().drop(columns=["Price"])
+
+        result = validate_products(df)
+        assert "price_unavailable" not in result.counts
+
+        with pytest.raises(KeyError):
+            validate_products(df, strict=True)
+
+    def test_custom_rule(self):
+        """Test aturan tambahan cukup dideklarasikan"""
+        rules = VALIDATION_RULES + (ValidationRule("cheap", "Price", lambda s: s != "$50.00"),)
+
+        result = validate_products(self._df(), rules=rules)
+
+        assert result.counts["cheap"] == 1
+        assert not result.mask.any()
+
+    def test_transform_and_remove_share_quarantine(self):
+        """Test transform_product_data dan remove_invalid_products meneruskan baris yang ditolak"""
+        sink = []
+        df = transform_product_data(self._df().to_dict("records"), quarantine=sink.append)
+        remove_invalid_products(df, quarantine=sink.append)
+
+        assert len(df) == 1
+        assert len(sink) == 1
+        assert len(sink[0]) == 4
+
+
+class TestParallelTransform:
+    """Test suite untuk transform_product_data_parallel"""
+
+    def _raw_data(self, rows=40):
+        raw_data = [
+            {
+                "Title": f"Product {i}",
+                "Price": f"${10 + i}.00",
+                "Rating": f"⭐{3 + (i % 20) / 10} / 5",
+                "Color": ["Red", "Blue"][i % 2],
+                "Size": "M",
+                "Gender": "Men",
+                "Timestamp": "2024-01-01 10:00:00"
+            }
+            for i in range(rows)
+        ]
+        raw_data[5]["Title"] = "Unknown Product"
+        raw_data[17]["Rating"] = "Not Rated"
+        return raw_data
+
+    def test_parallel_matches_single_process(self):
+        """Test hasil paralel sama dan urutannya terjaga"""
+        raw_data = self._raw_data()
+        expected = transform_product_data(raw_data)
+
+        result = transform_product_data_parallel(raw_data, workers=2, partition_size=7, min_rows=0)
+
+        pd.testing.assert_frame_equal(result, expected)
+
+    def test_parallel_compact_schema_after_concat(self):
+        """Test skema ringkas diterapkan setelah partisi digabung"""
+        result = transform_product_data_parallel(self._raw_data(), workers=2, partition_size=7, min_rows=0,
+                                                 compact_schema=True)
+
+        assert isinstance(result['Color'].dtype, pd.CategoricalDtype)
+        assert len(result) == 38
+
+    @patch('utils.transform.ProcessPoolExecutor')
+    def test_small_input_falls_back_to_single_process(self, mock_pool):
+        """Test input kecil tidak memakai process pool"""
+        result = transform_product_data_parallel(self._raw_data(), workers=4)
+
+        mock_pool.assert_not_called()
+        assert len(result) == 38
+
+    def test_transform_accepts_dataframe(self):
+        """Test transform_product_data menerima DataFrame tanpa mengubahnya"""
+        df = pd.DataFrame(self._raw_data())
+
+        result = transform_product_data(df)
+
+        assert len(result) == 38
+        assert df['Price'].iloc[0] == "$10.00"
+
+
+ENGINE_PARAMS = [
+    "pandas",
+    pytest.param("pyarrow", marks=pytest.mark.skipif(pa is None, reason="pyarrow not installed")),
+    pytest.param("polars", marks=pytest.mark.skipif(pl is None or pa is None, reason="polars not installed")),
+]
+
+class TestTransformEngines:
+    """Test suite untuk parity antar engine transformasi"""
+
+    def _raw_data(self):
+        return [
+            {"Title": "T-shirt", "Price": "$19.99", "Rating": "⭐4.5 / 5", "Color": "3 Colors",
+             "Size": "Size: M", "Gender": "Gender: Men", "Timestamp": "2024-01-01 10:00:00"},
+            {"Title": None, "Price": "$50.00", "Rating": "⭐4.0 / 5", "Color": "Red",
+             "Size": "M", "Gender": "Men", "Timestamp": "2024-01-01 10:00:00"},
+            {"Title": "Unknown Product", "Price": "$50.00", "Rating": "⭐4.0 / 5", "Color": "Red",
+             "Size": "M", "Gender": "Men", "Timestamp": "2024-01-01 10:00:00"},
+            {"Title": "Hoodie", "Price": "Price Unavailable", "Rating": "⭐4.0 / 5", "Color": "Red",
+             "Size": "M", "Gender": "Men", "Timestamp": "2024-01-01 10:00:00"},
+            {"Title": "Pants", "Price": None, "Rating": "⭐4.0 / 5", "Color": "Red",
+             "Size": "M", "Gender": "Men", "Timestamp": "2024-01-01 10:00:00"},
+            {"Title": "Jacket", "Price": "$80.00", "Rating": "⭐ Invalid Rating / 5", "Color": "Red",
+             "Size": "M", "Gender": "Men", "Timestamp": "2024-01-01 10:00:00"},
+            {"Title": "Cap", "Price": "$10.00", "Rating": "Not Rated", "Color": "Red",
+             "Size": "M", "Gender": "Men", "Timestamp": "2024-01-01 10:00:00"},
+            {"Title": "Socks", "Price": "$5.00", "Rating": None, "Color": "Red",
+             "Size": "M", "Gender": "Men", "Timestamp": "2024-01-01 10:00:00"},
+            {"Title": "Scarf", "Price": "$7.00", "Rating": "⭐ . / 5", "Color": "Red",
+             "Size": "M", "Gender": "Men", "Timestamp": "2024-01-01 10:00:00"},
+            {"Title": "Shoes", "Price": "$120.50", "Rating": "⭐3.9 / 5", "Color": None,
+             "Size": "L", "Gender": "Women", "Timestamp": "2024-01-01 10:00:00"},
+        ]
+
+    def _plain(self, df):
+        return df.astype(object).where(df.notna(), None)
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_engine_parity(self, engine):
+        """Test setiap engine menghasilkan data dan skema yang sama dengan pandas"""
+        expected = transform_product_data(self._raw_data())
+
+        result = transform_product_data(self._raw_data(), engine=engine)
+
+        assert list(result.columns) == list(expected.columns)
+        assert result['Price'].dtype == 'int64'
+        assert result['Rating'].dtype == 'float64'
+        pd.testing.assert_frame_equal(self._plain(result), self._plain(expected))
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_engine_parity_records_and_quarantine(self, engine):
+        """Test input ProductBatch dan baris quarantine sama di setiap engine"""
+        batch = ProductBatch(self._raw_data())
+        sink = []
+
+        result = transform_product_data(batch, quarantine=sink.append, engine=engine)
+
+        assert len(result) == 2
+        assert self._plain(sink[0])['Title'].tolist() == [
+            None, "Unknown Product", "Hoodie", "Pants", "Jacket", "Cap", "Socks", "Scarf"
+        ]
+
+    @pytest.mark.parametrize("engine", ENGINE_PARAMS)
+    def test_engine_output_is_cleaned_and_loaded(self, engine, tmp_path):
+        """Test output setiap engine diterima remove_invalid_products dan loader CSV"""
+        df = remove_invalid_products(transform_product_data(self._raw_data(), compact_schema=True, engine=engine))
+        csv_file = tmp_path / f"{engine}.csv"
+
+        load_to_csv(df, str(csv_file))
+
+        read_df = pd.read_csv(csv_file)
+        assert read_df['Title'].tolist() == ["T-shirt", "Shoes"]
+        assert read_df['Price'].tolist() == [319840, 1928000]
+        assert read_df['Rating'].tolist() == [4.5, 3.9]
+
+    def test_unknown_engine_raises(self):
+        """Test nama engine yang tidak dikenal"""
+        with pytest.raises(ValueError):
+            resolve_engine("spark")
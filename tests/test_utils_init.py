@@ -67,7 +67,7 @@ def test_scrape_products_from_utils():
     """Test scrape_products imported from utils"""
     from unittest.mock import patch, MagicMock
     
-    with patch('utils.extract.requests.get') as mock_get:
+    with patch('utils.extract.requests.Session.get') as mock_get:
         mock_response = MagicMock()
         mock_response.status_code = 200
         mock_response.content = '<html><body></body></html>'
@@ -4,12 +4,14 @@ Contains functions for Extract, Transform, and Load operations
 """
 
 try:
-    from .extract import extract_product_data, scrape_products
+    from .extract import extract_product_data, scrape_products, iter_pages, iter_products, replay_products
 except ImportError as e:
     print(f"Warning: Could not import extract module: {e}")
 
 try:
-    from .transform import transform_product_data, remove_invalid_products
+    from .transform import (
+        transform_product_data, remove_invalid_products, iter_transform_product_data, iter_remove_invalid_products
+    )
 except ImportError as e:
     print(f"Warning: Could not import transform module: {e}")
 
@@ -21,8 +23,13 @@ except ImportError as e:
 __all__ = [
     'extract_product_data',
     'scrape_products',
+    'iter_pages',
+    'iter_products',
+    'replay_products',
     'transform_product_data',
     'remove_invalid_products',
+    'iter_transform_product_data',
+    'iter_remove_invalid_products',
     'load_to_csv',
     'load_to_db',
     'load_to_google_sheets'
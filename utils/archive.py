@@ -0,0 +1,89 @@
+import gzip
+import json
+import os
+import threading
+from datetime import datetime
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+DEFAULT_CODEC = "zstd" if zstandard is not None else "gzip"
+
+def _compress(data, codec):
+    if codec == "zstd":
+        return zstandard.ZstdCompressor(level=3).compress(data)
+    return gzip.compress(data, compresslevel=6)
+
+def _decompress(data, codec):
+    if codec == "zstd":
+        if zstandard is None:
+            raise RuntimeError("Archive entry is zstd-compressed but zstandard is not installed.")
+        return zstandard.ZstdDecompressor().decompress(data)
+    return gzip.decompress(data)
+
+class PageArchive:
+    """Arsip HTML mentah append-only: satu segment file terkompresi + index JSONL berisi offset."""
+
+    def __init__(self, path="archive/pages.seg", codec=None, run_id=None):
+        self.path = path
+        self.index_path = path + ".index.jsonl"
+        self.codec = codec or DEFAULT_CODEC
+        if self.codec == "zstd" and zstandard is None:
+            print("zstandard is not installed. Falling back to gzip archive compression.")
+            self.codec = "gzip"
+        self.run_id = run_id or datetime.now().strftime("%Y%m%dT%H%M%S")
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+    def append(self, page, url, content):
+        """Tambahkan satu halaman ke segment lalu catat offset-nya di index."""
+        if isinstance(content, str):
+            content = content.encode("utf-8")
+        blob = _compress(content, self.codec)
+        fetched_at = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
+        with self._lock:
+            with open(self.path, "ab") as segment:
+                offset = segment.tell()
+                segment.write(blob)
+            entry = {
+                "run": self.run_id, "page": page, "url": url, "offset": offset,
+                "length": len(blob), "codec": self.codec, "fetched_at": fetched_at,
+            }
+            # Index ditulis setelah segment sehingga entry selalu menunjuk data yang lengkap
+            with open(self.index_path, "a", encoding="utf-8") as index:
+                index.write(json.dumps(entry) + "\n")
+
+    def entries(self, run_id=None):
+        """Entry index untuk satu run (default: run terakhir), diurutkan per halaman."""
+        if not os.path.exists(self.index_path):
+            return []
+        with open(self.index_path, encoding="utf-8") as index:
+            entries = [json.loads(line) for line in index if line.strip()]
+        if not entries:
+            return []
+        run_id = run_id or entries[-1]["run"]
+        return sorted((e for e in entries if e["run"] == run_id), key=lambda e: e["page"])
+
+    def runs(self):
+        """Daftar run_id yang ada di arsip sesuai urutan penulisan."""
+        seen = {}
+        if os.path.exists(self.index_path):
+            with open(self.index_path, encoding="utf-8") as index:
+                for line in index:
+                    if line.strip():
+                        seen.setdefault(json.loads(line)["run"], None)
+        return list(seen)
+
+    def iter_pages(self, run_id=None):
+        """Generator (entry, content) untuk setiap halaman yang diarsipkan pada suatu run."""
+        entries = self.entries(run_id)
+        if not entries:
+            return
+        with open(self.path, "rb") as segment:
+            for entry in entries:
+                segment.seek(entry["offset"])
+                yield entry, _decompress(segment.read(entry["length"]), entry["codec"])
@@ -0,0 +1,131 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import namedtuple
+
+# Response minimal yang dipakai scrape_page untuk halaman dari cache
+CachedResponse = namedtuple("CachedResponse", ["status_code", "content", "headers", "from_cache"])
+
+DEFAULT_MAX_BYTES = 256 * 1024 * 1024
+DEFAULT_TTL = 7 * 24 * 3600
+
+class PageCache:
+    """Cache halaman HTTP di disk (SQLite) dengan ETag/Last-Modified, LRU max_bytes dan TTL."""
+
+    def __init__(self, path=".cache/pages.sqlite", max_bytes=DEFAULT_MAX_BYTES, ttl=DEFAULT_TTL):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.ttl = ttl
+        self.hits = self.misses = self.stores = self.evictions = 0
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "url TEXT PRIMARY KEY, body BLOB NOT NULL, etag TEXT, last_modified TEXT, "
+            "size INTEGER NOT NULL, stored_at REAL NOT NULL, accessed_at REAL NOT NULL)"
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS idx_pages_accessed ON pages (accessed_at)")
+        self._conn.commit()
+
+    def get(self, url):
+        """Kembalikan (body, etag, last_modified) untuk url, None jika tidak ada atau kedaluwarsa."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT body, etag, last_modified, stored_at FROM pages WHERE url = ?", (url,)
+            ).fetchone()
+            if row is None:
+                return None
+            if self.ttl is not None and time.time() - row[3] > self.ttl:
+                self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+                self._conn.commit()
+                self.evictions += 1
+                return None
+            return row[0], row[1], row[2]
+
+    def conditional_headers(self, entry):
+        """Header If-None-Match/If-Modified-Since untuk entry cache."""
+        headers = {}
+        if entry is not None:
+            if entry[1]:
+                headers["If-None-Match"] = entry[1]
+            if entry[2]:
+                headers["If-Modified-Since"] = entry[2]
+        return headers
+
+    def put(self, url, body, etag=None, last_modified=None):
+        """Simpan body halaman lalu jalankan eviction LRU jika melebihi max_bytes."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (url, body, etag, last_modified, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (url, body, etag, last_modified, len(body), now, now),
+            )
+            self.stores += 1
+            self._evict_locked(now)
+            self._conn.commit()
+
+    def touch(self, url):
+        """Tandai entry sebagai baru divalidasi (304) untuk TTL dan urutan LRU."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute("UPDATE pages SET stored_at = ?, accessed_at = ? WHERE url = ?", (now, now, url))
+            self._conn.commit()
+
+    def evict(self):
+        """Hapus entry kedaluwarsa dan entry LRU sampai total ukuran <= max_bytes."""
+        with self._lock:
+            self._evict_locked(time.time())
+            self._conn.commit()
+
+    def _evict_locked(self, now):
+        if self.ttl is not None:
+            self.evictions += self._conn.execute("DELETE FROM pages WHERE stored_at < ?", (now - self.ttl,)).rowcount
+        if self.max_bytes is None:
+            return
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM pages").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        for url, size in self._conn.execute("SELECT url, size FROM pages ORDER BY accessed_at").fetchall():
+            self._conn.execute("DELETE FROM pages WHERE url = ?", (url,))
+            self.evictions += 1
+            total -= size
+            if total <= self.max_bytes:
+                break
+
+    def fetch(self, url, fetch):
+        """Jalankan `fetch(headers)` dengan conditional GET; 304 dilayani dari cache."""
+        entry = self.get(url)
+        response = fetch(self.conditional_headers(entry))
+        if response.status_code == 304 and entry is not None:
+            self.touch(url)
+            with self._lock:
+                self.hits += 1
+            return CachedResponse(200, entry[0], response.headers, True)
+        with self._lock:
+            self.misses += 1
+        if response.status_code == 200:
+            self.put(url, response.content, response.headers.get("ETag"), response.headers.get("Last-Modified"))
+        return response
+
+    def stats(self):
+        """Counter cache: hits, misses, stores, evictions dan ukuran saat ini."""
+        with self._lock:
+            entries, size = self._conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM pages").fetchone()
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "stores": self.stores,
+            "evictions": self.evictions,
+            "entries": entries,
+            "bytes": size,
+        }
+
+    def close(self):
+        """Tutup koneksi SQLite cache."""
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,90 @@
+import json
+import os
+import sqlite3
+import threading
+import time
+
+from .records import FIELDS, PageInfo, ProductRecord
+
+class CrawlCheckpoint:
+    """Spool SQLite berisi halaman yang sudah selesai beserta product data-nya."""
+
+    def __init__(self, path=".cache/crawl_checkpoint.sqlite"):
+        self.path = path
+        self.crawl_key = None
+        self.completed = set()
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            "CREATE TABLE IF NOT EXISTS pages ("
+            "crawl_key TEXT NOT NULL, page INTEGER NOT NULL, records TEXT NOT NULL, "
+            "total_pages INTEGER, has_next INTEGER, completed_at REAL NOT NULL, "
+            "PRIMARY KEY (crawl_key, page))"
+        )
+        self._conn.execute("CREATE TABLE IF NOT EXISTS runs (crawl_key TEXT PRIMARY KEY, run_id TEXT NOT NULL)")
+        self._conn.commit()
+
+    def start(self, crawl_key, resume=False):
+        """Mulai crawl; jika resume=False checkpoint lama untuk crawl_key dihapus."""
+        self.crawl_key = crawl_key
+        with self._lock:
+            if not resume:
+                self._conn.execute("DELETE FROM pages WHERE crawl_key = ?", (crawl_key,))
+                self._conn.execute("DELETE FROM runs WHERE crawl_key = ?", (crawl_key,))
+                self._conn.commit()
+            rows = self._conn.execute("SELECT page FROM pages WHERE crawl_key = ?", (crawl_key,)).fetchall()
+        self.completed = {row[0] for row in rows}
+        if self.completed:
+            print(f"Resuming crawl: {len(self.completed)} pages already completed.")
+        return self.completed
+
+    def bind_run(self, run_id):
+        """Kaitkan run_id arsip dengan crawl ini; saat resume kembalikan run_id crawl yang terputus."""
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR IGNORE INTO runs (crawl_key, run_id) VALUES (?, ?)", (self.crawl_key, run_id)
+            )
+            self._conn.commit()
+            return self._conn.execute(
+                "SELECT run_id FROM runs WHERE crawl_key = ?", (self.crawl_key,)
+            ).fetchone()[0]
+
+    def save(self, page, products, info):
+        """Simpan halaman yang selesai beserta records dan info pager-nya."""
+        rows = [list(p) if isinstance(p, tuple) else [p.get(field) for field in FIELDS] for p in products]
+        has_next = None if info.has_next is None else int(info.has_next)
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO pages (crawl_key, page, records, total_pages, has_next, completed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?)",
+                (self.crawl_key, page, json.dumps(rows), info.total_pages, has_next, time.time()),
+            )
+            self._conn.commit()
+        self.completed.add(page)
+
+    def load(self, page, compact=False):
+        """Ambil (products, PageInfo) halaman yang sudah selesai dari spool."""
+        with self._lock:
+            records, total_pages, has_next = self._conn.execute(
+                "SELECT records, total_pages, has_next FROM pages WHERE crawl_key = ? AND page = ?",
+                (self.crawl_key, page),
+            ).fetchone()
+        rows = json.loads(records)
+        products = [ProductRecord(*row) if compact else dict(zip(FIELDS, row)) for row in rows]
+        return products, PageInfo(total_pages, None if has_next is None else bool(has_next))
+
+    def clear(self):
+        """Hapus checkpoint crawl saat ini (dipanggil setelah crawl selesai)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM pages WHERE crawl_key = ?", (self.crawl_key,))
+            self._conn.execute("DELETE FROM runs WHERE crawl_key = ?", (self.crawl_key,))
+            self._conn.commit()
+        self.completed = set()
+
+    def close(self):
+        """Tutup koneksi SQLite checkpoint."""
+        with self._lock:
+            self._conn.close()
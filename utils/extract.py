@@ -1,17 +1,88 @@
+import re
 import requests
 import time
 import pandas as pd
-from bs4 import BeautifulSoup
+from bs4 import BeautifulSoup, SoupStrainer
+from collections import deque
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor
+from contextlib import ExitStack
+from itertools import chain, count
 from datetime import datetime
+from html import unescape
 
-HEADERS = {
-    "User-Agent": (
-        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
-        "(KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
-    )
-}
+try:
+    import lxml
+except ImportError:
+    lxml = None
 
-def extract_product_data(section):
+try:
+    from selectolax.lexbor import LexborHTMLParser
+except ImportError:
+    LexborHTMLParser = None
+
+from .checkpoint import CrawlCheckpoint
+from .records import TIMESTAMP_FORMAT, PageInfo, ProductBatch, ProductRecord
+from .session import HEADERS, RateLimiter, fetch_with_retry
+
+def _is_product_details(class_value):
+    """Cocokkan token class seperti find_all(class_="product-details"), termasuk div multi-class."""
+    return class_value is not None and "product-details" in class_value.split()
+
+PRODUCT_STRAINER = SoupStrainer("div", class_=_is_product_details)
+PARSER_BACKENDS = ("html.parser", "strainer", "lxml", "selectolax", "fast")
+DEFAULT_PARSER = "strainer"
+
+# Pager fashion-studio: <ul class="pagination"> ... "Page 1 of 50" ... <li class="page-item next">
+PAGINATION_PATTERN = re.compile(rb'class="[^"]*\bpagination\b')
+PAGE_OF_PATTERN = re.compile(rb"Page\s+(\d+)\s+of\s+(\d+)", re.IGNORECASE)
+NEXT_ITEM_PATTERN = re.compile(rb'<li[^>]*class="([^"]*\bnext\b[^"]*)"')
+REL_NEXT_PATTERN = re.compile(rb'rel="next"')
+
+# Fast path: pola untuk markup product-details yang reguler (tanpa membangun DOM)
+DIV_TAG_PATTERN = re.compile(r'<(/?)div\b([^>]*)>', re.IGNORECASE)
+CLASS_ATTR_PATTERN = re.compile(r'(?:^|\s)class="([^"]*)"', re.IGNORECASE)
+H3_PATTERN = re.compile(r'<h3\b([^>]*)>(.*?)</h3\s*>', re.IGNORECASE | re.DOTALL)
+SPAN_PATTERN = re.compile(r'<span\b([^>]*)>(.*?)</span\s*>', re.IGNORECASE | re.DOTALL)
+P_PATTERN = re.compile(r'<p\b[^>]*>(.*?)</p\s*>', re.IGNORECASE | re.DOTALL)
+TAG_PATTERN = re.compile(r'<[^>]*>')
+# Markup yang membuat fast path tidak aman: komentar/CDATA/script, atribut class yang tidak persis class="
+UNSAFE_PATTERN = re.compile(r'<!|<\?|<script\b|<style\b|<textarea\b|\sclass\s*=\s*(?!")|\sclass\s+=', re.IGNORECASE)
+# '>' di dalam nilai atribut berkutip memotong tag lebih awal pada pola [^>]* di atas
+QUOTED_GT_PATTERN = re.compile(r'<[a-z][^>]*=\s*(?:"[^"]*|\'[^\']*)>', re.IGNORECASE)
+PRODUCT_CLASS_TOKEN = re.compile(r'(?<![\w-])product-details(?![\w-])')
+
+def build_product_record(title, price, detail_texts, timestamp=None, compact=False):
+    """Susun product data dari title, price dan teks tiap <p> detail.
+
+    Mengembalikan dict, atau ProductRecord jika `compact=True`. `timestamp`
+    sebaiknya dihitung sekali per halaman oleh pemanggil.
+    """
+    rating = color = size = gender = None
+    for text in detail_texts:
+        if "Rating:" in text:
+            rating = text.split("Rating:")[1].strip()
+        elif "Colors" in text:
+            color = text.split()[0]
+        elif "Size:" in text:
+            size = text.split("Size:")[1].strip()
+        elif "Gender:" in text:
+            gender = text.split("Gender:")[1].strip()  
+    if timestamp is None:
+        timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    if compact:
+        return ProductRecord(title, price, rating, color, size, gender, timestamp)
+
+    return {
+        "Title": title,
+        "Price": price,
+        "Rating": rating,
+        "Color": color,
+        "Size": size,
+        "Gender": gender,
+        "Timestamp": timestamp
+    }
+
+def extract_product_data(section, timestamp=None, compact=False):
     """Ekstrak product data denagn beautifulsoup section."""
     try:
         title_elem = section.find("h3", class_="product-title")
@@ -20,30 +91,8 @@ def extract_product_data(section):
         price_elem = section.find("span", class_="price")
         price = price_elem.get_text(strip=True) if price_elem else None
 
-        details = section.find_all("p")
-
-        rating = color = size = gender = None
-        for detail in details:
-            text = detail.get_text(strip=True)
-            if "Rating:" in text:
-                rating = text.split("Rating:")[1].strip()
-            elif "Colors" in text:
-                color = text.split()[0]
-            elif "Size:" in text:
-                size = text.split("Size:")[1].strip()
-            elif "Gender:" in text:
-                gender = text.split("Gender:")[1].strip()  
-        timestamp = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-
-        return {
-            "Title": title,
-            "Price": price,
-            "Rating": rating,
-            "Color": color,
-            "Size": size,
-            "Gender": gender,
-            "Timestamp": timestamp
-        }
+        details = [detail.get_text(strip=True) for detail in section.find_all("p")]
+        return build_product_record(title, price, details, timestamp, compact)
     except AttributeError as e:
         print(f"Error extracting product data - AttributeError: {e}. Skipping product.")
         return None
@@ -51,43 +100,416 @@ def extract_product_data(section):
         print(f"Unexpected error while extracting product data: {e}. Skipping product.")
         return None
 
-def scrape_products(base_url, start_page=1, max_pages=50, delay=2):
-    """Scrape product data from multiple pages with error handling."""
+def extract_product_data_selectolax(node, timestamp=None, compact=False):
+    """Ekstrak product data dari node selectolax (hasil sama dengan extract_product_data)."""
+    try:
+        title_elem = node.css_first("h3.product-title")
+        title = title_elem.text(strip=True) if title_elem else None
+
+        price_elem = node.css_first("span.price")
+        price = price_elem.text(strip=True) if price_elem else None
+
+        details = [detail.text(strip=True) for detail in node.css("p")]
+        return build_product_record(title, price, details, timestamp, compact)
+    except Exception as e:
+        print(f"Unexpected error while extracting product data: {e}. Skipping product.")
+        return None
+
+def resolve_parser(parser):
+    """Validasi nama parser backend, fallback ke 'strainer' jika library tidak terinstall."""
+    if parser not in PARSER_BACKENDS:
+        raise ValueError(f"Unknown parser backend '{parser}'. Choose one of {PARSER_BACKENDS}.")
+    if (parser == "lxml" and lxml is None) or (parser == "selectolax" and LexborHTMLParser is None):
+        print(f"Parser backend '{parser}' is not installed. Falling back to 'strainer'.")
+        return "strainer"
+    return parser
+
+def _has_class(attrs, name):
+    match = CLASS_ATTR_PATTERN.search(attrs)
+    return bool(match) and name in match.group(1).split()
+
+def _fast_text(fragment):
+    """Setara get_text(strip=True): teks tiap node di-unescape, di-strip lalu digabung."""
+    return "".join(piece for piece in (unescape(part).strip() for part in TAG_PATTERN.split(fragment)) if piece)
+
+def _fast_sections(html):
+    """Potong HTML menjadi isi tiap div.product-details; None jika div bersarang tidak seimbang."""
+    sections = []
+    depth = 0
+    start = None
+    for match in DIV_TAG_PATTERN.finditer(html):
+        closing, attrs = match.group(1), match.group(2)
+        if start is None:
+            if not closing and _has_class(attrs, "product-details"):
+                start, depth = match.end(), 1
+            continue
+        if closing:
+            depth -= 1
+            if depth == 0:
+                sections.append(html[start:match.start()])
+                start = None
+        elif _has_class(attrs, "product-details"):
+            return None  # product-details bersarang
+        else:
+            depth += 1
+    return None if start is not None else sections
+
+def _fast_section_is_regular(section):
+    """Sanity check struktur: tag yang dipakai fast path harus seimbang dan tidak bersarang."""
+    for tag in ("h3", "span", "p"):
+        if len(re.findall(rf"<{tag}\b", section, re.IGNORECASE)) != len(re.findall(rf"</{tag}\s*>", section, re.IGNORECASE)):
+            return False
+    nested_p = any(re.search(r"<p\b", inner, re.IGNORECASE) for inner in P_PATTERN.findall(section))
+    nested_span = any(re.search(r"<span\b", inner, re.IGNORECASE) for _, inner in SPAN_PATTERN.findall(section))
+    return not (nested_p or nested_span)
+
+def parse_products_fast(content, timestamp=None, compact=False):
+    """Ekstrak product data langsung dari HTML mentah tanpa membangun tree BeautifulSoup.
+
+    Kembalikan (jumlah product section, list product data), atau None jika
+    halaman gagal sanity check struktur sehingga pemanggil harus memakai
+    jalur BeautifulSoup.
+    """
+    if isinstance(content, bytes):
+        try:
+            content = content.decode("utf-8")
+        except UnicodeDecodeError:
+            return None
+    if QUOTED_GT_PATTERN.search(content):
+        return None
+    sections = _fast_sections(content)
+    # Setiap token product-details harus menghasilkan satu section; selisih berarti ada
+    # div yang tidak dikenali pola fast path (misalnya class berkutip tunggal)
+    if sections is None or len(sections) != len(PRODUCT_CLASS_TOKEN.findall(content)):
+        return None
+    if timestamp is None:
+        timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+
+    products = []
+    for section in sections:
+        if UNSAFE_PATTERN.search(section) or not _fast_section_is_regular(section):
+            return None
+        title = next((_fast_text(inner) for attrs, inner in H3_PATTERN.findall(section)
+                      if _has_class(attrs, "product-title")), None)
+        price = next((_fast_text(inner) for attrs, inner in SPAN_PATTERN.findall(section)
+                      if _has_class(attrs, "price")), None)
+        details = [_fast_text(inner) for inner in P_PATTERN.findall(section)]
+        products.append(build_product_record(title, price, details, timestamp, compact))
+    return len(sections), products
+
+def parse_products(content, parser=DEFAULT_PARSER, timestamp=None, compact=False):
+    """Parse HTML satu halaman; kembalikan (jumlah product section, list product data).
+
+    Timestamp diambil sekali untuk seluruh halaman; `compact=True`
+    menghasilkan ProductRecord alih-alih dict. Backend 'fast' memakai
+    parse_products_fast dan otomatis kembali ke 'strainer' jika halaman
+    gagal sanity check.
+    """
+    parser = resolve_parser(parser)
+    if timestamp is None:
+        timestamp = datetime.now().strftime(TIMESTAMP_FORMAT)
+    if parser == "fast":
+        result = parse_products_fast(content, timestamp, compact)
+        if result is not None:
+            return result
+        parser = "strainer"
+    if parser == "selectolax":
+        sections = LexborHTMLParser(content).css("div.product-details")
+        extract = extract_product_data_selectolax
+    else:
+        if parser == "html.parser":
+            soup = BeautifulSoup(content, "html.parser")
+        else:
+            soup = BeautifulSoup(content, "lxml" if parser == "lxml" else "html.parser", parse_only=PRODUCT_STRAINER)
+        sections = soup.find_all("div", class_="product-details")
+        extract = extract_product_data
+
     products = []
-    for page in range(start_page, start_page + max_pages):
-        url = base_url.format(page)
+    for section in sections:
+        product_data = extract(section, timestamp, compact)
+        if product_data:  # Only append if extraction was successful
+            products.append(product_data)
+    return len(sections), products
+
+def fetch_page(url, session=None, retry_policy=None, rate_limiter=None, cache=None, hedger=None):
+    """Ambil satu halaman dengan retry; jika `cache` diberikan pakai conditional GET."""
+    def fetch(headers=None):
+        return fetch_with_retry(url, session=session, retry_policy=retry_policy,
+                                rate_limiter=rate_limiter, headers=headers, hedger=hedger)
+
+    if cache is None:
+        return fetch()
+    return cache.fetch(url, fetch)
+
+def download_page(base_url, page, archive=None, **fetch_options):
+    """Ambil HTML mentah satu halaman; kembalikan content atau None jika gagal.
+
+    `fetch_options` diteruskan ke fetch_page (session, retry_policy, rate_limiter, cache, hedger).
+    Jika `archive` (utils.archive.PageArchive) diberikan, HTML mentah ikut diarsipkan.
+    """
+    url = base_url.format(page)
+    try:
+        response = fetch_page(url, **fetch_options)
+        if response.status_code != 200:
+            print(f"Failed to retrieve page {page}: Status code {response.status_code}")
+            return None
+
+        if archive is not None:
+            archive.append(page, url, response.content)
+        return response.content
+
+    except requests.exceptions.Timeout:
+        print(f"Timeout error while retrieving page {page}. Skipping to next page.")
+    except requests.exceptions.ConnectionError:
+        print(f"Connection error while retrieving page {page}. Skipping to next page.")
+    except Exception as e:
+        print(f"Unexpected error while scraping page {page}: {e}. Skipping to next page.")
+    return None
+
+def parse_page(page, content, parser=DEFAULT_PARSER, compact=False):
+    """Parse HTML satu halaman menjadi list product data (kosong jika gagal)."""
+    try:
+        section_count, products = parse_products(content, parser, compact=compact)
+    except Exception as e:
+        print(f"Unexpected error while scraping page {page}: {e}. Skipping to next page.")
+        return []
+
+    if not section_count:
+        print(f"No products found on page {page}. Continuing to the next page.")
+        return products
+
+    print(f"Scraped page {page} with {section_count} products.")
+    return products
+
+def detect_pagination(content):
+    """Baca pager halaman; kembalikan PageInfo(total_pages, has_next).
+
+    Nilai None berarti informasi tersebut tidak ditemukan di HTML.
+    """
+    if isinstance(content, str):
+        content = content.encode("utf-8")
+    match = PAGE_OF_PATTERN.search(content)
+    total_pages = int(match.group(2)) if match else None
+    if not PAGINATION_PATTERN.search(content):
+        return PageInfo(total_pages, None)
+    next_item = NEXT_ITEM_PATTERN.search(content)
+    has_next = bool(next_item and b"disabled" not in next_item.group(1)) or bool(REL_NEXT_PATTERN.search(content))
+    return PageInfo(total_pages, has_next)
+
+class PaginationTracker:
+    """Tentukan kapan crawl berhenti: halaman terakhir dari pager atau N halaman kosong berturut-turut."""
+
+    def __init__(self, start_page=1, max_pages=50, max_empty_pages=3):
+        if max_pages is None and not max_empty_pages:
+            raise ValueError("max_pages=None requires max_empty_pages to bound the crawl.")
+        self.start_page = start_page
+        self.last_page = start_page + max_pages - 1 if max_pages is not None else None
+        self.max_empty_pages = max_empty_pages
+        self.total_pages = None
+        self.empty_pages = 0
+
+    def pages(self, first_page):
+        """Daftar halaman yang masih harus diambil mulai `first_page` (pasti jika total diketahui)."""
+        last_page = self.last_page
+        if self.total_pages is not None:
+            last_page = self.total_pages if last_page is None else min(last_page, self.total_pages)
+        if last_page is None:
+            return count(first_page)
+        return range(first_page, last_page + 1)
+
+    def should_stop(self, page, products, info):
+        """Perbarui status dengan hasil satu halaman; True jika crawl sebaiknya berhenti."""
+        if info is None:  # Halaman gagal diambil, tidak dihitung sebagai halaman kosong
+            return False
+        if info.total_pages is not None:
+            self.total_pages = info.total_pages
+        if info.has_next is False or (self.total_pages is not None and page >= self.total_pages):
+            print(f"Reached last page ({page}). Stopping crawl.")
+            return True
+        self.empty_pages = 0 if products else self.empty_pages + 1
+        if self.max_empty_pages and self.empty_pages >= self.max_empty_pages:
+            print(f"No products on {self.empty_pages} consecutive pages. Stopping crawl at page {page}.")
+            return True
+        return False
+
+def _scrape_page(base_url, page, parser, compact, cpu_pool=None, checkpoint=None, **fetch_options):
+    """Download + parse satu halaman; kembalikan (products atau Future, PageInfo atau None).
+
+    Halaman yang sudah ada di `checkpoint` diambil dari spool tanpa request.
+    """
+    if checkpoint is not None and page in checkpoint.completed:
+        return checkpoint.load(page, compact)
+    content = download_page(base_url, page, **fetch_options)
+    if content is None:
+        return [], None
+    info = detect_pagination(content)
+    if cpu_pool is not None:
+        return cpu_pool.submit(parse_page, page, content, parser, compact), info
+    return parse_page(page, content, parser, compact), info
+
+def scrape_page(base_url, page, parser=DEFAULT_PARSER, compact=False, **fetch_options):
+    """Scrape satu halaman dan kembalikan list product data (kosong jika gagal)."""
+    return _scrape_page(base_url, page, parser, compact, **fetch_options)[0]
+
+def _ordered_map(executor, func, items, window):
+    """Seperti executor.map, tetapi hanya `window` task yang berjalan di depan konsumen."""
+    pending = deque()
+    for item in items:
+        pending.append(executor.submit(func, item))
+        if len(pending) >= window:
+            yield pending.popleft().result()
+    while pending:
+        yield pending.popleft().result()
+
+def _save_checkpoint(page, products, info, checkpoint):
+    """Catat halaman yang berhasil diambil ke checkpoint (sebelum diberikan ke konsumen)."""
+    if checkpoint is not None and info is not None and page not in checkpoint.completed:
+        checkpoint.save(page, products, info)
+
+def _iter_pages_concurrent(base_url, tracker, max_workers, requests_per_second, parser, compact, parse_workers,
+                           checkpoint, fetch_options):
+    """Download di thread pool; parse di thread yang sama atau di process pool (parse_workers > 1).
+
+    Halaman pertama diambil lebih dulu agar total halaman dari pager
+    (jika ada) menjadi daftar kerja yang pasti untuk halaman berikutnya.
+    """
+    fetch_options = dict(fetch_options)
+    if fetch_options.get("rate_limiter") is None:
+        fetch_options["rate_limiter"] = RateLimiter(requests_per_second)
+    use_cpu_pool = bool(parse_workers and parse_workers > 1)
+    with ExitStack() as stack:
+        io_pool = stack.enter_context(ThreadPoolExecutor(max_workers=max(max_workers or 1, 1)))
+        cpu_pool = stack.enter_context(ProcessPoolExecutor(max_workers=parse_workers)) if use_cpu_pool else None
+
+        def task(page):
+            return page, _scrape_page(base_url, page, parser, compact, cpu_pool, checkpoint, **fetch_options)
+
+        def remaining():
+            # Dievaluasi setelah halaman pertama sehingga total halaman sudah diketahui
+            window = max(max_workers or 1, parse_workers or 1) * 2
+            yield from _ordered_map(io_pool, task, tracker.pages(tracker.start_page + 1), window)
+
+        for page, (products, info) in chain([task(tracker.start_page)], remaining()):
+            if isinstance(products, Future):
+                products = products.result()
+            _save_checkpoint(page, products, info, checkpoint)
+            yield page, products
+            if tracker.should_stop(page, products, info):
+                return
+
+def iter_pages(base_url, start_page=1, max_pages=50, delay=2, max_workers=1, requests_per_second=None,
+               parser=DEFAULT_PARSER, compact=False, parse_workers=None, max_empty_pages=3, checkpoint=None,
+               resume=False, **fetch_options):
+    """Generator yang menghasilkan (page, list product data) segera setelah halaman diparse.
+
+    Parameter sama dengan scrape_products. Pada mode concurrent hanya
+    2 x max_workers halaman yang diambil di depan konsumen sehingga memori
+    tetap terbatas.
+    """
+    tracker = PaginationTracker(start_page, max_pages, max_empty_pages)
+    if isinstance(checkpoint, str):
+        checkpoint = CrawlCheckpoint(checkpoint)
+    if checkpoint is not None:
+        checkpoint.start(base_url, resume)
+        archive = fetch_options.get("archive")
+        if archive is not None:
+            # Halaman dari checkpoint tidak diunduh ulang; pakai run_id crawl yang terputus
+            # agar replay_products(archive) tetap mencakup seluruh halaman crawl
+            archive.run_id = checkpoint.bind_run(archive.run_id)
+
+    if (max_workers and max_workers > 1) or (parse_workers and parse_workers > 1):
+        yield from _iter_pages_concurrent(
+            base_url, tracker, max_workers, requests_per_second, parser, compact, parse_workers,
+            checkpoint, fetch_options
+        )
+    else:
+        for page in tracker.pages(start_page):
+            resumed = checkpoint is not None and page in checkpoint.completed
+            page_products, info = _scrape_page(base_url, page, parser, compact, checkpoint=checkpoint, **fetch_options)
+            _save_checkpoint(page, page_products, info, checkpoint)
+            yield page, page_products
+            if tracker.should_stop(page, page_products, info):
+                break
+            if page_products and not resumed:
+                time.sleep(delay)
+
+    # Crawl selesai tanpa interupsi: checkpoint tidak diperlukan lagi
+    if checkpoint is not None:
+        checkpoint.clear()
+
+def iter_products(base_url, start_page=1, max_pages=50, delay=2, **options):
+    """Generator yang menghasilkan product data satu per satu (lihat iter_pages)."""
+    for _, page_products in iter_pages(base_url, start_page, max_pages, delay, **options):
+        yield from page_products
+
+def scrape_product_batch(base_url, start_page=1, max_pages=50, delay=2, **options):
+    """Seperti scrape_products, tetapi mengumpulkan hasil ke ProductBatch kolumnar."""
+    batch = ProductBatch()
+    for _, page_products in iter_pages(base_url, start_page, max_pages, delay, compact=True, **options):
+        batch.extend(page_products)
+
+    if not len(batch):
+        print("No products were scraped. Please check the base URL or website structure.")
+
+    return batch
+
+def scrape_products(base_url, start_page=1, max_pages=50, delay=2, **options):
+    """Scrape product data from multiple pages with error handling.
+
+    Opsi tambahan (semua opsional):
+    - max_workers / requests_per_second: ambil halaman secara paralel (thread
+      pool); `delay` diganti batas global request per detik. Urutan hasil
+      tetap mengikuti urutan halaman.
+    - session / retry_policy: session HTTP (default: session bersama dengan
+      keep-alive + pooling) dan retry untuk 429/5xx/timeout.
+    - parser: backend HTML 'html.parser', 'strainer', 'lxml' atau 'selectolax'.
+    - compact: hasilkan ProductRecord (tuple) alih-alih dict per produk.
+    - parse_workers: jika > 1, parsing HTML dijalankan di ProcessPoolExecutor
+      terpisah dari download (thread pool max_workers, dibatasi
+      requests_per_second; `delay` tidak dipakai).
+    - rate_limiter: pengganti RateLimiter(requests_per_second), misalnya
+      utils.session.AdaptiveRateController yang menyesuaikan rate dan
+      concurrency (max_workers menjadi batas atas) terhadap respons server.
+    - max_empty_pages: berhenti setelah N halaman berturut-turut tanpa produk.
+      Crawl juga berhenti di halaman terakhir menurut pager ("Page x of N" /
+      link Next). max_pages=None berarti crawl sampai halaman terakhir.
+    - checkpoint / resume: utils.checkpoint.CrawlCheckpoint (atau path SQLite)
+      untuk menyimpan halaman yang selesai. Dengan resume=True halaman yang
+      sudah ada di checkpoint tidak diambil ulang; checkpoint dihapus setelah
+      crawl selesai.
+    - cache: utils.cache.PageCache untuk conditional GET ke cache di disk.
+    - hedger: utils.session.RequestHedger untuk menduplikasi request yang
+      lebih lambat dari persentil latency; hedger.report() memberi p50/p95/p99.
+    - archive: utils.archive.PageArchive untuk menyimpan HTML mentah (lihat replay_products).
+      Dengan checkpoint + resume, archive memakai run_id crawl yang terputus
+      sehingga halaman dari checkpoint tetap ada di run arsip yang sama.
+    """
+    products = list(iter_products(base_url, start_page, max_pages, delay, **options))
+
+    if not products:
+        print("No products were scraped. Please check the base URL or website structure.")
+
+    return products
+
+def replay_pages(archive, run_id=None, parser=DEFAULT_PARSER, compact=False):
+    """Generator (page, list product data) dari arsip HTML tanpa akses jaringan.
+
+    Timestamp produk memakai waktu halaman diambil, bukan waktu replay.
+    """
+    for entry, content in archive.iter_pages(run_id):
         try:
-            response = requests.get(url, headers=HEADERS, timeout=10)
-            if response.status_code != 200:
-                print(f"Failed to retrieve page {page}: Status code {response.status_code}")
-                continue
-
-            soup = BeautifulSoup(response.content, "html.parser")
-            product_sections = soup.find_all("div", class_="product-details")
-
-            if not product_sections:
-                print(f"No products found on page {page}. Continuing to the next page.")
-                continue
-
-            for section in product_sections:
-                product_data = extract_product_data(section)
-                if product_data:  # Only append if extraction was successful
-                    products.append(product_data)
-
-            print(f"Scraped page {page} with {len(product_sections)} products.")
-            time.sleep(delay)
-            
-        except requests.exceptions.Timeout:
-            print(f"Timeout error while retrieving page {page}. Skipping to next page.")
-            continue
-        except requests.exceptions.ConnectionError:
-            print(f"Connection error while retrieving page {page}. Skipping to next page.")
-            continue
+            section_count, products = parse_products(content, parser, entry["fetched_at"], compact)
         except Exception as e:
-            print(f"Unexpected error while scraping page {page}: {e}. Skipping to next page.")
+            print(f"Unexpected error while replaying page {entry['page']}: {e}. Skipping to next page.")
             continue
+        print(f"Replayed page {entry['page']} with {section_count} products.")
+        yield entry["page"], products
 
+def replay_products(archive, run_id=None, parser=DEFAULT_PARSER, compact=False):
+    """Kembalikan semua product data dari satu run arsip (default: run terakhir)."""
+    products = [
+        product for _, page_products in replay_pages(archive, run_id, parser, compact) for product in page_products
+    ]
     if not products:
-        print("No products were scraped. Please check the base URL or website structure.")
-
-    return products
\ No newline at end of file
+        print("No products found in archive. Please check the archive path or run id.")
+    return products
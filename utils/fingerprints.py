@@ -0,0 +1,63 @@
+import os
+import sqlite3
+import threading
+
+import numpy as np
+
+# Batas aman jumlah parameter per query SQLite
+QUERY_CHUNK_SIZE = 500
+
+class FingerprintStore:
+    """Penyimpanan SQLite ringkas berisi hash 64-bit produk yang sudah pernah dimuat."""
+
+    def __init__(self, path=".cache/fingerprints.sqlite"):
+        self.path = path
+        self._lock = threading.Lock()
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute("CREATE TABLE IF NOT EXISTS fingerprints (hash INTEGER PRIMARY KEY) WITHOUT ROWID")
+        self._conn.commit()
+
+    @staticmethod
+    def _to_sqlite(hashes):
+        """uint64 -> int64 (SQLite INTEGER bertanda) dengan bit yang sama."""
+        return np.asarray(hashes, dtype=np.uint64).view(np.int64).tolist()
+
+    def contains(self, hashes):
+        """Kembalikan array bool: True untuk hash yang sudah ada di store."""
+        values = self._to_sqlite(hashes)
+        seen = set()
+        with self._lock:
+            for start in range(0, len(values), QUERY_CHUNK_SIZE):
+                chunk = values[start:start + QUERY_CHUNK_SIZE]
+                rows = self._conn.execute(
+                    f"SELECT hash FROM fingerprints WHERE hash IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                seen.update(row[0] for row in rows)
+        return np.fromiter((value in seen for value in values), dtype=bool, count=len(values))
+
+    def add(self, hashes):
+        """Tambahkan hash ke store; kembalikan jumlah hash baru."""
+        values = self._to_sqlite(hashes)
+        with self._lock:
+            before = self._conn.total_changes
+            self._conn.executemany("INSERT OR IGNORE INTO fingerprints (hash) VALUES (?)", ((v,) for v in values))
+            self._conn.commit()
+            return self._conn.total_changes - before
+
+    def __len__(self):
+        with self._lock:
+            return self._conn.execute("SELECT COUNT(*) FROM fingerprints").fetchone()[0]
+
+    def clear(self):
+        """Hapus semua fingerprint (produk akan dimuat ulang pada run berikutnya)."""
+        with self._lock:
+            self._conn.execute("DELETE FROM fingerprints")
+            self._conn.commit()
+
+    def close(self):
+        """Tutup koneksi SQLite fingerprint store."""
+        with self._lock:
+            self._conn.close()
@@ -1,20 +1,392 @@
-from sqlalchemy import create_engine
+import csv
+import io
+import threading
+import uuid
+from datetime import datetime
+
+from sqlalchemy import (
+    BigInteger, Column, DateTime, Float, Index, Integer, MetaData, Table, Text, create_engine, inspect, text
+)
+from sqlalchemy.dialects.sqlite import insert as sqlite_insert
 from google.oauth2.service_account import Credentials
 from googleapiclient.discovery import build
 import pandas as pd
 
-def load_to_db(data, db_url):
-    """Fungsi untuk menyimpan data ke dalam PostgreSQL."""
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+try:
+    import pyarrow as pa
+    import pyarrow.dataset as ds
+except ImportError:
+    pa = ds = None
+
+from .records import NATURAL_KEY, TIMESTAMP_FORMAT
+
+DEFAULT_CHUNKSIZE = 10000
+# Penanda NULL eksplisit untuk COPY CSV: field kosong tanpa kutip tetap dibaca sebagai string ''
+COPY_NULL = "\\N"
+LOAD_MODES = ("append", "upsert")
+CONTENT_HASH_COLUMN = "content_hash"
+# Kolom yang tidak ikut content hash: Timestamp selalu berubah setiap run
+CONTENT_HASH_EXCLUDE = ("Timestamp",)
+# Pengganti NULL di kolom teks natural key: NULL selalu dianggap berbeda oleh unique index
+KEY_NULL_FILL = ""
+DB_POOL_SIZE = 5
+DB_MAX_OVERFLOW = 10
+PRODUCTS_INDEXED_COLUMNS = ("Title", "Gender", "Timestamp")
+COLUMNAR_FORMATS = ("parquet", "feather")
+PARTITION_COLUMN = "scrape_date"
+DEFAULT_ROW_GROUP_SIZE = 100_000
+
+_engines = {}
+_engines_lock = threading.Lock()
+# (url, table) yang skemanya sudah dicek di proses ini
+_checked_schemas = set()
+
+def _to_plain_dtypes(data):
+    """Kembalikan kolom skema ringkas (category/float32/datetime) dan kolom pyarrow ke tipe biasa.
+
+    polars DataFrame lebih dulu diubah menjadi pandas DataFrame.
+    """
+    if pl is not None and isinstance(data, pl.DataFrame):
+        data = data.to_pandas()
+    plain = {}
+    for column in data.columns:
+        series = data[column]
+        if isinstance(series.dtype, pd.CategoricalDtype):
+            plain[column] = series.astype(object)
+        elif series.dtype == 'float32':
+            # Lewat str agar 3.9 tidak menjadi 3.9000000953674316
+            plain[column] = series.astype(str).astype('float64')
+        elif pd.api.types.is_datetime64_any_dtype(series):
+            plain[column] = series.dt.strftime(TIMESTAMP_FORMAT)
+        elif isinstance(series.dtype, (pd.ArrowDtype, pd.StringDtype)):
+            if pd.api.types.is_float_dtype(series.dtype):
+                plain[column] = series.astype('float64')
+            elif pd.api.types.is_integer_dtype(series.dtype) and not series.hasnans:
+                plain[column] = series.astype('int64')
+            else:
+                plain[column] = series.astype(object).where(series.notna(), None)
+    return data.assign(**plain) if plain else data
+
+def get_engine(db_url, pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_pre_ping=True):
+    """Kembalikan engine bersama untuk db_url (dibuat saat pertama dipakai, lalu dipakai ulang).
+
+    Opsi pool hanya berlaku saat engine dibuat. SQLite memakai pool bawaan
+    dialeknya, sehingga hanya pool_pre_ping yang diteruskan.
+    """
+    with _engines_lock:
+        engine = _engines.get(db_url)
+        if engine is None:
+            options = {"pool_pre_ping": pool_pre_ping}
+            if not db_url.startswith("sqlite"):
+                options.update(pool_size=pool_size, max_overflow=max_overflow)
+            engine = _engines[db_url] = create_engine(db_url, **options)
+        return engine
+
+def dispose_engines():
+    """Tutup semua engine bersama beserta koneksi di pool-nya (dipanggil saat shutdown)."""
+    with _engines_lock:
+        for engine in _engines.values():
+            engine.dispose()
+        _engines.clear()
+        _checked_schemas.clear()
+
+def products_table(name='products', metadata=None, partition=False):
+    """Skema tabel products yang dikelola utils.load.
+
+    Kolom bertipe eksplisit, surrogate key id, unique index pada NATURAL_KEY
+    dan index pada Title/Gender/Timestamp. partition=True (khusus PostgreSQL)
+    mempartisi tabel RANGE per bulan pada Timestamp; PostgreSQL mewajibkan
+    kolom partisi ada di setiap unique key, sehingga Timestamp ikut masuk
+    primary key dan natural key (mode upsert tidak tersedia).
+    """
+    metadata = metadata if metadata is not None else MetaData()
+    key = NATURAL_KEY + (("Timestamp",) if partition else ())
+    return Table(
+        name, metadata,
+        Column("id", BigInteger().with_variant(Integer, "sqlite"), primary_key=True, autoincrement=True),
+        Column("Title", Text, nullable=False),
+        Column("Price", BigInteger),
+        Column("Rating", Float),
+        Column("Color", Text),
+        Column("Size", Text),
+        Column("Gender", Text),
+        Column("Timestamp", DateTime, primary_key=partition),
+        Column(CONTENT_HASH_COLUMN, BigInteger),
+        Index(f"ux_{name}_natural_key", *key, unique=True),
+        *(Index(f"ix_{name}_{column.lower()}", column) for column in PRODUCTS_INDEXED_COLUMNS),
+        **({"postgresql_partition_by": 'RANGE ("Timestamp")'} if partition else {}),
+    )
+
+def _same_python_type(current, expected):
+    try:
+        return current.python_type is expected.python_type
+    except NotImplementedError:
+        return True
+
+def migrate_products_schema(con, table='products', partition=False):
+    """Cek ringan skema tabel sebelum load: buat tabel, kolom dan index yang belum ada.
+
+    Hanya perubahan aditif yang dijalankan; tipe kolom yang berbeda, primary
+    key yang hilang dan unique index yang tidak bisa dibuat karena data lama
+    berisi natural key ganda hanya dilaporkan. Sebelum unique index dibuat,
+    NULL di kolom teks natural key diisi KEY_NULL_FILL seperti pada load.
+    Mengembalikan list pesan.
+    """
+    schema = products_table(table, partition=partition)
+    inspector = inspect(con)
+    if not inspector.has_table(table):
+        schema.create(con)
+        return [f"created table {table}"]
+
+    messages = []
+    preparer = con.dialect.identifier_preparer
+    existing = {column["name"]: column["type"] for column in inspector.get_columns(table)}
+    for column in schema.columns:
+        expected_type = column.type.compile(dialect=con.dialect)
+        if column.name not in existing:
+            if column.primary_key:
+                messages.append(f"column {column.name} is missing and cannot be added automatically")
+                continue
+            con.execute(text(
+                f"ALTER TABLE {preparer.format_table(schema)} ADD COLUMN {preparer.format_column(column)} {expected_type}"
+            ))
+            messages.append(f"added column {column.name}")
+        elif not _same_python_type(existing[column.name], column.type):
+            messages.append(f"column {column.name} is {existing[column.name]}, expected {expected_type}")
+
+    existing_indexes = {index["name"] for index in inspector.get_indexes(table)}
+    for index in schema.indexes:
+        if index.name in existing_indexes:
+            continue
+        if index.unique:
+            key = [column.name for column in index.columns]
+            # Samakan data lama dengan load baru (NULL -> KEY_NULL_FILL) sebelum index dibuat;
+            # tanpa ini baris ber-key NULL akan di-insert ulang oleh upsert/append berikutnya
+            for column in _nullable_key_columns(key):
+                filled = con.execute(text(
+                    f"UPDATE {preparer.quote(table)} SET {preparer.quote(column)} = :fill "
+                    f"WHERE {preparer.quote(column)} IS NULL"
+                ), {"fill": KEY_NULL_FILL}).rowcount
+                if filled:
+                    messages.append(f"filled {filled} NULL values in key column {column}")
+            duplicates = _count_duplicate_keys(con, table, key)
+            if duplicates:
+                messages.append(f"index {index.name} not created: {duplicates} duplicate keys in {table}")
+                continue
+        index.create(con)
+        messages.append(f"created index {index.name}")
+    return messages
+
+def _count_duplicate_keys(con, table, key):
+    """Jumlah kombinasi key (tanpa NULL, sesuai unique index) yang muncul lebih dari sekali."""
+    preparer = con.dialect.identifier_preparer
+    columns = ", ".join(preparer.quote(column) for column in key)
+    not_null = " AND ".join(f"{preparer.quote(column)} IS NOT NULL" for column in key)
+    return con.execute(text(
+        f"SELECT COUNT(*) FROM (SELECT 1 FROM {preparer.quote(table)} WHERE {not_null} "
+        f"GROUP BY {columns} HAVING COUNT(*) > 1) duplicates"
+    )).scalar()
+
+def _ensure_month_partitions(con, table, timestamps):
+    """Buat partisi bulanan PostgreSQL untuk setiap bulan scrape di data."""
+    preparer = con.dialect.identifier_preparer
+    months = pd.to_datetime(timestamps, format=TIMESTAMP_FORMAT).dt.to_period("M").dropna().unique()
+    for month in months:
+        start, end = month.start_time.date(), (month + 1).start_time.date()
+        partition_name = f"{table}_{month.strftime('%Y_%m')}"
+        con.execute(text(
+            f"CREATE TABLE IF NOT EXISTS {preparer.quote(partition_name)} "
+            f"PARTITION OF {preparer.quote(table)} FOR VALUES FROM ('{start}') TO ('{end}')"
+        ))
+
+def _copy_insert(table, conn, keys, data_iter):
+    """Metode to_sql untuk PostgreSQL: chunk ditulis sebagai CSV ke buffer lalu di-COPY ... FROM STDIN."""
+    buffer = io.StringIO()
+    csv.writer(buffer).writerows(
+        tuple(COPY_NULL if value is None else value for value in row) for row in data_iter
+    )
+    buffer.seek(0)
+
+    preparer = conn.dialect.identifier_preparer
+    name = preparer.quote(table.name)
+    if table.schema:
+        name = f"{preparer.quote_schema(table.schema)}.{name}"
+    columns = ", ".join(preparer.quote(key) for key in keys)
+    sql = f"COPY {name} ({columns}) FROM STDIN WITH (FORMAT csv, NULL '{COPY_NULL}')"
+
+    with conn.connection.cursor() as cursor:
+        if hasattr(cursor, "copy_expert"):  # psycopg2
+            cursor.copy_expert(sql, buffer)
+        else:  # psycopg 3
+            with cursor.copy(sql) as copy:
+                copy.write(buffer.getvalue())
+
+def _insert_options(dialect, chunksize):
+    """Pilih metode insert to_sql: COPY untuk PostgreSQL, multi-row INSERT untuk dialek lain.
+
+    SQLite tetap memakai executemany bawaan: tanpa round trip jaringan,
+    multi-row INSERT justru lebih lambat (lihat benchmarks/bench_load.py).
+    """
+    if dialect == "postgresql":
+        return {"method": _copy_insert, "chunksize": chunksize}
+    if dialect == "sqlite":
+        return {"method": None, "chunksize": chunksize}
+    return {"method": "multi", "chunksize": chunksize}
+
+def _content_hashes(data, key=NATURAL_KEY):
+    """Hash 64-bit bertanda (muat di BIGINT) dari kolom selain natural key dan Timestamp."""
+    columns = [column for column in data.columns if column not in key and column not in CONTENT_HASH_EXCLUDE]
+    return pd.util.hash_pandas_object(data[columns], index=False).to_numpy().view('int64')
+
+def _nullable_key_columns(key=NATURAL_KEY):
+    """Kolom teks natural key yang nullable (NULL-nya disimpan sebagai KEY_NULL_FILL)."""
+    return [
+        column.name for column in products_table().columns
+        if column.name in key and column.nullable and isinstance(column.type, Text)
+    ]
+
+def _fill_key_nulls(data, key=NATURAL_KEY):
+    """Ganti NULL di kolom teks natural key yang nullable dengan KEY_NULL_FILL."""
+    columns = [column for column in _nullable_key_columns(key) if column in data.columns]
+    return data.assign(**{column: data[column].fillna(KEY_NULL_FILL) for column in columns})
+
+def _stage(con, data, table, chunksize):
+    """Muat data ke staging table sementara berkolom sama dengan tabel tujuan.
+
+    Mengembalikan nama staging table dan daftar kolom (sudah di-quote).
+    """
+    preparer = con.dialect.identifier_preparer
+    staging = preparer.quote(f"{table}_staging")
+    columns = ", ".join(preparer.quote(column) for column in data.columns)
+    # Driver sqlite3 meng-commit CREATE TEMPORARY TABLE di luar transaksi sehingga staging dari load
+    # yang gagal bisa tertinggal di koneksi pool; schema temp di-qualify agar tabel permanen tidak ikut terhapus
+    temp_schema = "pg_temp" if con.dialect.name == "postgresql" else "temp"
+    con.execute(text(f"DROP TABLE IF EXISTS {temp_schema}.{staging}"))
+    con.execute(text(f"CREATE TEMPORARY TABLE {staging} AS SELECT {columns} FROM {preparer.quote(table)} WHERE 1 = 0"))
+    data.to_sql(f"{table}_staging", con=con, if_exists='append', index=False, **_insert_options(con.dialect.name, chunksize))
+    return staging, columns
+
+def _insert_ignore(table, conn, keys, data_iter):
+    """Metode to_sql untuk SQLite: executemany INSERT ... ON CONFLICT DO NOTHING per chunk."""
+    statement = sqlite_insert(table.table).on_conflict_do_nothing()
+    return conn.execute(statement, [dict(zip(keys, row)) for row in data_iter]).rowcount
+
+def _append(con, data, table, chunksize):
+    """Append data dan lewati baris yang natural key-nya sudah ada (ON CONFLICT DO NOTHING).
+
+    SQLite memakai _insert_ignore langsung ke tabel tujuan; PostgreSQL
+    memuat lewat staging table (agar COPY tetap dipakai) lalu INSERT ...
+    ON CONFLICT DO NOTHING; dialek lain memakai to_sql biasa. Mengembalikan
+    jumlah baris yang benar-benar di-insert.
+    """
+    if con.dialect.name == "sqlite":
+        inserted = _fill_key_nulls(data).to_sql(
+            table, con=con, if_exists='append', index=False, method=_insert_ignore, chunksize=chunksize
+        )
+        return inserted or 0
+    if con.dialect.name != "postgresql":
+        data.to_sql(table, con=con, if_exists='append', index=False, **_insert_options(con.dialect.name, chunksize))
+        return len(data)
+
+    staging, columns = _stage(con, _fill_key_nulls(data), table, chunksize)
+    inserted = con.execute(text(
+        f"INSERT INTO {con.dialect.identifier_preparer.quote(table)} ({columns}) "
+        f"SELECT {columns} FROM {staging} ON CONFLICT DO NOTHING"
+    )).rowcount
+    con.execute(text(f"DROP TABLE {staging}"))
+    return inserted
+
+def _upsert(con, data, table, chunksize, key=NATURAL_KEY):
+    """Muat data ke staging table sementara lalu INSERT ... ON CONFLICT DO UPDATE ke tabel tujuan.
+
+    Baris hanya ditulis ulang jika content hash-nya berubah. NULL pada kolom
+    teks natural key disimpan sebagai KEY_NULL_FILL agar tetap cocok dengan
+    ON CONFLICT. Mengembalikan jumlah baris inserted, updated dan unchanged.
+    """
+    preparer = con.dialect.identifier_preparer
+    data = _fill_key_nulls(data, key)
+    # Satu baris per natural key: ON CONFLICT tidak boleh mengenai baris yang sama dua kali
+    data = data.drop_duplicates(subset=list(key), keep="last")
+    data = data.assign(**{CONTENT_HASH_COLUMN: _content_hashes(data, key)})
+
+    target = preparer.quote(table)
+    staging, columns = _stage(con, data, table, chunksize)
+    key_columns = ", ".join(preparer.quote(column) for column in key)
+
+    # Perbandingan NULL-safe: SQLite memakai IS, PostgreSQL IS NOT DISTINCT FROM
+    same = "IS" if con.dialect.name == "sqlite" else "IS NOT DISTINCT FROM"
+    join = " AND ".join(f"t.{preparer.quote(column)} {same} s.{preparer.quote(column)}" for column in key)
+    matched, unchanged = con.execute(text(
+        f"SELECT COUNT(*), COALESCE(SUM(CASE WHEN t.{CONTENT_HASH_COLUMN} = s.{CONTENT_HASH_COLUMN} THEN 1 ELSE 0 END), 0) "
+        f"FROM {staging} s JOIN {target} t ON {join}"
+    )).one()
+
+    updates = ", ".join(
+        f"{preparer.quote(column)} = excluded.{preparer.quote(column)}" for column in data.columns if column not in key
+    )
+    # WHERE true diperlukan SQLite agar ON CONFLICT tidak dibaca sebagai bagian dari JOIN
+    con.execute(text(
+        f"INSERT INTO {target} ({columns}) SELECT {columns} FROM {staging} WHERE true "
+        f"ON CONFLICT ({key_columns}) DO UPDATE SET {updates} "
+        f"WHERE {target}.{CONTENT_HASH_COLUMN} IS NULL OR {target}.{CONTENT_HASH_COLUMN} <> excluded.{CONTENT_HASH_COLUMN}"
+    ))
+    con.execute(text(f"DROP TABLE {staging}"))
+    return {"inserted": len(data) - matched, "updated": matched - unchanged, "unchanged": unchanged}
+
+def load_to_db(data, db_url, table='products', chunksize=DEFAULT_CHUNKSIZE, mode='append', partition=False):
+    """Fungsi untuk menyimpan data ke dalam PostgreSQL.
+
+    Data dimuat dalam satu transaksi: PostgreSQL memakai COPY ... FROM STDIN
+    per chunk, dialek lain memakai to_sql method='multi' dengan chunksize.
+    mode='upsert' memuat lewat staging table dan INSERT ... ON CONFLICT pada
+    natural key (lihat _upsert) dan mengembalikan dict jumlah
+    inserted/updated/unchanged; mode append melewati baris yang natural
+    key-nya sudah ada (lihat _append) dan mengembalikan jumlah baris baru.
+    Jika load gagal (transaksi di-rollback) hasilnya None.
+
+    Sebelum load pertama per proses, skema tabel dicek terhadap
+    products_table (migrate_products_schema). partition=True membuat tabel
+    PostgreSQL dipartisi per bulan scrape.
+    """
     if create_engine is None:
         print("SQLAlchemy is not installed. Skipping database load.")
         return
+    if mode not in LOAD_MODES:
+        raise ValueError(f"Unknown load mode '{mode}'. Choose one of {LOAD_MODES}.")
+    if partition and mode == 'upsert':
+        raise ValueError("Upsert mode is not supported for partitioned tables.")
     
     try:
-        engine = create_engine(db_url)
+        engine = get_engine(db_url)
+        data = _to_plain_dtypes(data)
+        if partition and engine.dialect.name != "postgresql":
+            print(f"Partitioning is only supported on PostgreSQL. Loading {table} without partitions.")
+            partition = False
+        schema_key = (engine.url.render_as_string(), table)
         
-        with engine.connect() as con:
-            data.to_sql('products', con=con, if_exists='append', index=False)
-            print(f"Data berhasil ditambahkan ke database! ({len(data)} baris)")
+        with engine.begin() as con:
+            if schema_key not in _checked_schemas:
+                for message in migrate_products_schema(con, table, partition):
+                    print(f"Schema {table}: {message}")
+            if partition:
+                _ensure_month_partitions(con, table, data['Timestamp'])
+            if mode == 'upsert':
+                counts = _upsert(con, data, table, chunksize)
+            else:
+                inserted = _append(con, data, table, chunksize)
+        _checked_schemas.add(schema_key)
+        if mode == 'upsert':
+            print(f"Data berhasil di-upsert ke database! ({counts['inserted']} inserted, "
+                  f"{counts['updated']} updated, {counts['unchanged']} unchanged)")
+            return counts
+        print(f"Data berhasil ditambahkan ke database! ({inserted} baris, "
+              f"{len(data) - inserted} sudah ada dan dilewati)")
+        return inserted
     except ModuleNotFoundError as e:
         if 'psycopg2' in str(e):
             print(f"Error: psycopg2 tidak terinstall. Install dengan: pip install psycopg2-binary")
@@ -26,11 +398,55 @@ def load_to_db(data, db_url):
 def load_to_csv(data, file_path):
     """Fungsi untuk menyimpan data ke dalam file CSV."""
     try:
-        data.to_csv(file_path, index=False)
+        _to_plain_dtypes(data).to_csv(file_path, index=False)
         print(f"Data berhasil disimpan ke {file_path}")
     except Exception as e:
         print(f"Terjadi kesalahan saat menyimpan data ke CSV: {e}")
 
+def load_to_parquet(data, root_path, compression="zstd", row_group_size=DEFAULT_ROW_GROUP_SIZE, file_format="parquet"):
+    """Simpan data sebagai dataset Parquet/Feather dengan partisi Hive per tanggal scrape.
+
+    Setiap run menulis file baru part-<run_id>-N di
+    root_path/scrape_date=YYYY-MM-DD/, sehingga data run sebelumnya tetap
+    ada dan pembaca bisa melewati tanggal yang tidak dibutuhkan. Timestamp
+    disimpan bertipe timestamp. compression: 'zstd', 'snappy' (Parquet),
+    'lz4' (Feather) atau None. Mengembalikan list path file yang ditulis.
+    """
+    if ds is None:
+        print("pyarrow is not installed. Skipping columnar load.")
+        return []
+    if file_format not in COLUMNAR_FORMATS:
+        raise ValueError(f"Unknown columnar format '{file_format}'. Choose one of {COLUMNAR_FORMATS}.")
+
+    try:
+        if pl is not None and isinstance(data, pl.DataFrame):
+            data = data.to_pandas()
+        timestamps = data['Timestamp']
+        if not pd.api.types.is_datetime64_any_dtype(timestamps):
+            timestamps = pd.to_datetime(timestamps, format=TIMESTAMP_FORMAT, errors='coerce')
+        data = data.assign(Timestamp=timestamps, **{PARTITION_COLUMN: timestamps.dt.strftime('%Y-%m-%d').fillna('unknown')})
+
+        fmt = ds.ParquetFileFormat() if file_format == "parquet" else ds.IpcFileFormat()
+        extension = "parquet" if file_format == "parquet" else "feather"
+        run_id = f"{datetime.now().strftime('%Y%m%dT%H%M%S')}-{uuid.uuid4().hex[:8]}"
+        written = []
+        ds.write_dataset(
+            pa.Table.from_pandas(data, preserve_index=False), root_path,
+            format=fmt,
+            file_options=fmt.make_write_options(compression=compression),
+            partitioning=ds.partitioning(pa.schema([(PARTITION_COLUMN, pa.string())]), flavor="hive"),
+            basename_template=f"part-{run_id}-{{i}}.{extension}",
+            existing_data_behavior="overwrite_or_ignore",
+            max_rows_per_group=row_group_size,
+            min_rows_per_group=min(row_group_size, len(data)),
+            file_visitor=lambda written_file: written.append(written_file.path),
+        )
+        print(f"Data berhasil disimpan ke {root_path} ({len(data)} baris, {len(written)} file {file_format})")
+        return written
+    except Exception as e:
+        print(f"Terjadi kesalahan saat menyimpan data ke {file_format}: {e}")
+        return []
+
 def load_to_google_sheets(df,spreadsheet_id: str,range_name: str,service_account_file: str = "./google-sheets-api.json"):
     """Simpan DataFrame ke Google Sheets."""
     try:
@@ -41,7 +457,7 @@ def load_to_google_sheets(df,spreadsheet_id: str,range_name: str,service_account
         sheet = service.spreadsheets()
 
         # Convert DataFrame ke list of lists
-        values = [df.columns.tolist()] + df.values.tolist()
+        values = [df.columns.tolist()] + _to_plain_dtypes(df).values.tolist()
         body = {'values': values}
 
         result = sheet.values().update(
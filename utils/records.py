@@ -0,0 +1,66 @@
+from collections import namedtuple
+from typing import NamedTuple, Optional
+
+import pandas as pd
+
+FIELDS = ("Title", "Price", "Rating", "Color", "Size", "Gender", "Timestamp")
+TIMESTAMP_FORMAT = "%Y-%m-%d %H:%M:%S"
+# Natural key produk: kombinasi kolom yang mengidentifikasi satu produk di katalog
+NATURAL_KEY = ("Title", "Color", "Size", "Gender", "Price")
+
+# Info pager satu halaman; None berarti tidak ditemukan di HTML
+PageInfo = namedtuple("PageInfo", ["total_pages", "has_next"])
+
+class ProductRecord(NamedTuple):
+    """Representasi ringkas satu produk (tuple, tanpa dict per produk)."""
+    Title: Optional[str]
+    Price: Optional[str]
+    Rating: Optional[str]
+    Color: Optional[str]
+    Size: Optional[str]
+    Gender: Optional[str]
+    Timestamp: Optional[str]
+
+class ProductBatch:
+    """Builder kolumnar: product data ditambahkan langsung ke list per kolom."""
+
+    __slots__ = ("columns",)
+
+    def __init__(self, records=None):
+        self.columns = {field: [] for field in FIELDS}
+        if records is not None:
+            self.extend(records)
+
+    def append(self, record):
+        """Tambahkan satu ProductRecord/tuple atau dict product data."""
+        if isinstance(record, tuple):
+            for column, value in zip(self.columns.values(), record):
+                column.append(value)
+        else:
+            for field, column in self.columns.items():
+                column.append(record.get(field))
+
+    def extend(self, records):
+        for record in records:
+            self.append(record)
+
+    def __len__(self):
+        return len(self.columns["Title"])
+
+    def __iter__(self):
+        return (ProductRecord(*values) for values in zip(*self.columns.values()))
+
+    def to_dataframe(self):
+        """Bangun DataFrame langsung dari kolom (tanpa list of dict)."""
+        return pd.DataFrame(self.columns, columns=list(FIELDS))
+
+def records_to_dataframe(raw_data):
+    """Ubah ProductBatch, list ProductRecord atau list dict menjadi DataFrame (DataFrame disalin dangkal)."""
+    if isinstance(raw_data, pd.DataFrame):
+        # Salinan dangkal agar hasil filter tidak dianggap view dari DataFrame milik pemanggil
+        return raw_data.copy(deep=False)
+    if isinstance(raw_data, ProductBatch):
+        return raw_data.to_dataframe()
+    if isinstance(raw_data, list) and raw_data and isinstance(raw_data[0], tuple):
+        return pd.DataFrame.from_records(raw_data, columns=list(FIELDS))
+    return pd.DataFrame(raw_data)
@@ -0,0 +1,344 @@
+import random
+import threading
+import time
+from collections import deque
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.util import make_headers
+
+HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/96.0.4664.110 Safari/537.36"
+    )
+}
+
+# Status yang dianggap sementara dan layak dicoba ulang
+RETRY_STATUSES = frozenset({429, 500, 502, 503, 504})
+DEFAULT_POOL_SIZE = 20
+
+_session = None
+_session_lock = threading.Lock()
+
+class RateLimiter:
+    """Batasi jumlah request per detik secara global (thread-safe)."""
+
+    def __init__(self, requests_per_second=None):
+        self.interval = 1.0 / requests_per_second if requests_per_second else 0.0
+        self._lock = threading.Lock()
+        self._next_slot = time.monotonic()
+
+    def wait(self):
+        """Tunggu sampai slot request berikutnya tersedia."""
+        if not self.interval:
+            return
+        with self._lock:
+            now = time.monotonic()
+            slot = max(self._next_slot, now)
+            self._next_slot = slot + self.interval
+        if slot > now:
+            time.sleep(slot - now)
+
+    def record(self, latency, response=None, error=None):
+        """Hook setelah setiap attempt; RateLimiter biasa tidak beradaptasi."""
+
+class AdaptiveRateController(RateLimiter):
+    """Rate limiter AIMD untuk extractor.
+
+    Rate dan concurrency naik sedikit demi sedikit selama latency stabil
+    (additive increase) dan dipotong `decrease_factor` saat server
+    membalas 429/503, timeout, atau p95 latency naik di atas
+    `latency_tolerance` x baseline (multiplicative decrease). Nilai
+    selalu dijaga di antara batas min/max.
+    """
+
+    def __init__(self, initial_rate=2.0, min_rate=0.5, max_rate=20.0, initial_concurrency=2,
+                 min_concurrency=1, max_concurrency=16, increase=0.5, decrease_factor=0.5,
+                 latency_window=50, min_samples=10, latency_tolerance=1.5, cooldown=1.0,
+                 throttle_statuses=(429, 503)):
+        super().__init__(initial_rate)
+        self.rate = float(initial_rate)
+        self.min_rate = min_rate
+        self.max_rate = max_rate
+        self.concurrency = float(initial_concurrency)
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.increase = increase
+        self.decrease_factor = decrease_factor
+        self.min_samples = min_samples
+        self.latency_tolerance = latency_tolerance
+        self.cooldown = cooldown
+        self.throttle_statuses = frozenset(throttle_statuses)
+        self.baseline_p95 = None
+        self.decreases = 0
+        self._latencies = deque(maxlen=latency_window)
+        self._last_decrease = float("-inf")
+        self._in_flight = 0
+        self._condition = threading.Condition()
+
+    def wait(self):
+        """Tunggu slot concurrency lalu slot rate berikutnya."""
+        with self._condition:
+            while self._in_flight >= int(self.concurrency):
+                self._condition.wait()
+            self._in_flight += 1
+        super().wait()
+
+    def record(self, latency, response=None, error=None):
+        """Perbarui rate/concurrency berdasarkan hasil satu request."""
+        with self._condition:
+            self._in_flight = max(0, self._in_flight - 1)
+            status = response.status_code if response is not None else None
+            if isinstance(error, requests.exceptions.Timeout):
+                self._decrease("timeout")
+            elif status in self.throttle_statuses:
+                self._decrease(f"status {status}")
+            elif response is not None:
+                self._latencies.append(latency)
+                p95 = self.p95()
+                if p95 is not None and self.baseline_p95 is not None and p95 > self.baseline_p95 * self.latency_tolerance:
+                    self._decrease(f"p95 latency {p95:.3f}s > {self.latency_tolerance}x baseline {self.baseline_p95:.3f}s")
+                else:
+                    if p95 is not None and (self.baseline_p95 is None or p95 < self.baseline_p95):
+                        self.baseline_p95 = p95
+                    self._increase()
+            self._condition.notify_all()
+
+    def p95(self):
+        """p95 latency dari jendela terakhir, None jika sampel belum cukup."""
+        if len(self._latencies) < self.min_samples:
+            return None
+        return _percentile(sorted(self._latencies), 0.95)
+
+    def _set_rate(self, rate):
+        self.rate = min(self.max_rate, max(self.min_rate, rate))
+        self.interval = 1.0 / self.rate
+
+    def _increase(self):
+        previous = int(self.rate)
+        # Sekitar +increase req/s untuk setiap detik traffic yang sukses
+        self._set_rate(self.rate + self.increase / max(self.rate, 1.0))
+        self.concurrency = min(self.max_concurrency, self.concurrency + 1.0 / max(self.concurrency, 1.0))
+        if int(self.rate) > previous:
+            print(f"Adaptive rate increased to {self.rate:.2f} req/s, concurrency {int(self.concurrency)}.")
+
+    def _decrease(self, reason):
+        now = time.monotonic()
+        if now - self._last_decrease < self.cooldown:
+            return
+        self._last_decrease = now
+        self.decreases += 1
+        self._set_rate(self.rate * self.decrease_factor)
+        self.concurrency = max(self.min_concurrency, self.concurrency * self.decrease_factor)
+        self._latencies.clear()
+        print(f"Adaptive rate decreased to {self.rate:.2f} req/s, concurrency {int(self.concurrency)} ({reason}).")
+
+    def snapshot(self):
+        """Status controller saat ini untuk logging/monitoring."""
+        with self._condition:
+            return {
+                "rate": self.rate,
+                "concurrency": int(self.concurrency),
+                "p95": self.p95(),
+                "baseline_p95": self.baseline_p95,
+                "decreases": self.decreases,
+            }
+
+class RequestHedger:
+    """Hedged request: kirim duplikat jika respons lebih lambat dari persentil latency yang teramati.
+
+    Jumlah duplikat dibatasi `max_extra_ratio` dari total request. Latency
+    setiap halaman dicatat sehingga p50/p95/p99 dan jumlah hedge bisa
+    dilaporkan setelah crawl (lihat report()).
+    """
+
+    def __init__(self, percentile=0.95, min_samples=20, max_extra_ratio=0.1, min_delay=0.05, max_workers=32,
+                 enabled=True):
+        self.percentile = percentile
+        self.min_samples = min_samples
+        self.max_extra_ratio = max_extra_ratio
+        self.min_delay = min_delay
+        self.enabled = enabled
+        self.requests = self.hedges = self.hedge_wins = 0
+        self.latencies = {}
+        self._lock = threading.Lock()
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="hedge")
+
+    def hedge_delay(self):
+        """Batas tunggu sebelum duplikat dikirim, None jika belum cukup sampel."""
+        with self._lock:
+            if len(self.latencies) < self.min_samples:
+                return None
+            return max(self.min_delay, _percentile(sorted(self.latencies.values()), self.percentile))
+
+    def _can_hedge(self):
+        with self._lock:
+            if self.hedges + 1 > self.max_extra_ratio * self.requests:
+                return False
+            self.hedges += 1
+            return True
+
+    def get(self, session, url, **kwargs):
+        """session.get dengan hedging; kembalikan respons pertama yang berhasil."""
+        with self._lock:
+            self.requests += 1
+        start = time.monotonic()
+        delay = self.hedge_delay() if self.enabled else None
+        primary = self._executor.submit(session.get, url, **kwargs)
+        futures = [primary]
+        if delay is not None:
+            done, _ = wait(futures, timeout=delay)
+            if not done and self._can_hedge():
+                print(f"Hedging request for {url} after {delay:.3f}s.")
+                futures.append(self._executor.submit(session.get, url, **kwargs))
+
+        pending = set(futures)
+        while True:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            winner = next((f for f in futures if f in done and f.exception() is None), None)
+            if winner is not None or not pending:
+                break
+        if winner is None:
+            # Semua attempt gagal: teruskan exception dari request utama
+            primary.result()
+        if winner is not primary:
+            with self._lock:
+                self.hedge_wins += 1
+        with self._lock:
+            self.latencies[url] = time.monotonic() - start
+        return winner.result()
+
+    def report(self):
+        """Ringkasan latency per halaman (p50/p95/p99) dan jumlah hedge."""
+        with self._lock:
+            ordered = sorted(self.latencies.values())
+            summary = {"pages": len(ordered), "requests": self.requests, "hedges": self.hedges,
+                       "hedge_wins": self.hedge_wins}
+        for name, q in (("p50", 0.50), ("p95", 0.95), ("p99", 0.99)):
+            summary[name] = _percentile(ordered, q) if ordered else None
+        return summary
+
+    def close(self):
+        """Hentikan thread pool hedging (request yang kalah tidak ditunggu)."""
+        self._executor.shutdown(wait=False)
+
+class RetryPolicy:
+    """Kebijakan retry dengan exponential backoff + jitter dan dukungan Retry-After."""
+
+    def __init__(self, max_retries=3, backoff_factor=0.5, max_backoff=30.0, jitter=0.5,
+                 retry_statuses=RETRY_STATUSES):
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.retry_statuses = frozenset(retry_statuses)
+
+    def should_retry(self, attempt, response=None):
+        """True jika attempt berikutnya masih diizinkan untuk response ini."""
+        if attempt >= self.max_retries:
+            return False
+        return response is None or response.status_code in self.retry_statuses
+
+    def backoff(self, attempt, response=None):
+        """Hitung jeda sebelum attempt berikutnya (detik)."""
+        retry_after = parse_retry_after(response.headers.get("Retry-After")) if response is not None else None
+        if retry_after is not None:
+            return min(retry_after, self.max_backoff)
+        delay = min(self.max_backoff, self.backoff_factor * (2 ** attempt))
+        return delay + random.uniform(0, delay * self.jitter)
+
+DEFAULT_RETRY_POLICY = RetryPolicy()
+
+def _percentile(ordered, q):
+    """Persentil sederhana (nearest-rank) dari list yang sudah terurut."""
+    return ordered[min(len(ordered) - 1, int(q * (len(ordered) - 1) + 0.5))]
+
+def parse_retry_after(value):
+    """Ubah header Retry-After (detik atau HTTP-date) menjadi detik, None jika tidak valid."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except (TypeError, ValueError):
+        pass
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+def create_session(pool_size=DEFAULT_POOL_SIZE, headers=None):
+    """Buat requests.Session dengan connection pooling, keep-alive dan kompresi."""
+    session = requests.Session()
+    # Retry ditangani oleh fetch_with_retry agar Retry-After dan jitter konsisten
+    adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size, max_retries=0)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    session.headers.update(HEADERS)
+    # gzip/deflate selalu, br jika brotli terinstall
+    session.headers.update(make_headers(keep_alive=True, accept_encoding=True))
+    if headers:
+        session.headers.update(headers)
+    return session
+
+def get_session():
+    """Kembalikan session bersama untuk modul extract (dibuat saat pertama dipakai)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = create_session()
+        return _session
+
+def close_session():
+    """Tutup session bersama beserta koneksi di pool-nya."""
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+def fetch_with_retry(url, session=None, retry_policy=None, rate_limiter=None, timeout=10, headers=None,
+                     hedger=None):
+    """GET url dengan retry untuk timeout, connection error dan status 429/5xx.
+
+    Mengembalikan response terakhir; exception Timeout/ConnectionError
+    diteruskan jika semua attempt gagal. Dengan `hedger` (RequestHedger)
+    request yang lambat diduplikasi.
+    """
+    session = session or get_session()
+    retry_policy = retry_policy or DEFAULT_RETRY_POLICY
+    attempt = 0
+    while True:
+        response = error = None
+        if rate_limiter is not None:
+            rate_limiter.wait()
+        start = time.monotonic()
+        try:
+            if hedger is not None:
+                response = hedger.get(session, url, timeout=timeout, headers=headers)
+            else:
+                response = session.get(url, timeout=timeout, headers=headers)
+        except (requests.exceptions.Timeout, requests.exceptions.ConnectionError) as e:
+            error = e
+        finally:
+            if rate_limiter is not None:
+                rate_limiter.record(time.monotonic() - start, response, error)
+
+        if error is not None:
+            if not retry_policy.should_retry(attempt):
+                raise error
+            wait = retry_policy.backoff(attempt)
+            print(f"Retrying {url} in {wait:.2f}s after {type(error).__name__} (attempt {attempt + 1}/{retry_policy.max_retries}).")
+        else:
+            if not retry_policy.should_retry(attempt, response):
+                return response
+            wait = retry_policy.backoff(attempt, response)
+            print(f"Retrying {url} in {wait:.2f}s after status {response.status_code} (attempt {attempt + 1}/{retry_policy.max_retries}).")
+        time.sleep(wait)
+        attempt += 1
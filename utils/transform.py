@@ -1,12 +1,49 @@
+import os
+import re
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from itertools import islice
+
 import pandas as pd
 import logging
 
+try:
+    import pyarrow as pa
+except ImportError:
+    pa = None
+
+try:
+    import polars as pl
+except ImportError:
+    pl = None
+
+from .records import FIELDS, NATURAL_KEY, TIMESTAMP_FORMAT, ProductBatch, records_to_dataframe
+
 # Setup logging
 logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
 logger = logging.getLogger(__name__)
 
-def remove_invalid_products(df):
-    """Menghapus data produk yang tidak valid berdasarkan kriteria tertentu."""
+PRICE_CLEAN_PATTERN = re.compile(r'[^0-9.]')
+# Named group diperlukan oleh str.extract untuk kolom string pyarrow
+RATING_PATTERN = re.compile(r'(?P<rating>[\d.]+)')
+INVALID_RATING_PATTERN = re.compile(r'Invalid|Not Rated')
+COMPACT_CATEGORY_COLUMNS = ('Color', 'Size', 'Gender')
+INT32_MAX = 2**31 - 1
+DEFAULT_CHUNK_SIZE = 1000
+PARALLEL_MIN_ROWS = 200000
+PARTITIONS_PER_WORKER = 4
+TRANSFORM_ENGINES = ("pandas", "pyarrow", "polars")
+DEFAULT_ENGINE = "pandas"
+DEDUP_KEY = NATURAL_KEY
+
+def remove_invalid_products(df, quarantine=None, rules=None):
+    """Menghapus data produk yang tidak valid berdasarkan CLEANUP_RULES.
+
+    quarantine (opsional) dipanggil dengan DataFrame baris yang ditolak.
+    rules dapat diganti, misalnya VALIDATION_RULES untuk aturan transform
+    yang lebih ketat.
+    """
     try:
         if df is None or df.empty:
             logger.warning("Input DataFrame is None or empty. Returning empty DataFrame.")
@@ -14,17 +51,9 @@ def remove_invalid_products(df):
         
         initial_count = len(df)
         
-        # Hapus baris dengan Title = 'Unknown Product'
-        df = df[df['Title'] != 'Unknown Product']
-        
-        # Hapus baris dengan Price = 'Price Unavailable' atau None
-        df = df[~df['Price'].isin(['Price Unavailable', None])]
-        
-        # Hapus baris dengan Rating = 'Invalid Rating/5' atau 'Not Rated'
-        df = df[~df['Rating'].isin(['Invalid Rating/5', 'Not Rated'])]
-        
-        # Hapus baris dengan Rating = NaN (nilai yang tidak bisa dikonversi)
-        df = df[df['Rating'].notna()]
+        # Semua aturan digabung menjadi satu mask, kolom yang hilang menjadi KeyError
+        result = validate_products(df, CLEANUP_RULES if rules is None else rules, quarantine=quarantine, strict=True)
+        df = df[result.mask]
         
         removed_count = initial_count - len(df)
         logger.info(f"Removed {removed_count} invalid products. Remaining: {len(df)}")
@@ -38,64 +67,150 @@ def remove_invalid_products(df):
         logger.error(f"Error removing invalid products: {e}")
         return pd.DataFrame()
 
-def transform_product_data(raw_data):
-    """Mengubah data menjadi DataFrame dengan error handling."""
+def _is_not_none(series):
+    """Mask vektor untuk `value is not None` (NaN tetap dianggap ada, sama seperti filter lama).
+
+    Kolom pyarrow tidak membedakan None dan NaN, keduanya menjadi NA.
+    """
+    if series.dtype != object:
+        return series.notna()
+    return pd.Series(series.to_numpy(dtype=object) != None, index=series.index)  # noqa: E711
+
+def _is_valid_rating_text(series):
+    """Mask untuk Rating teks seperti 'Invalid Rating / 5' atau 'Not Rated'; nilai numerik selalu lolos."""
+    try:
+        return ~series.str.contains(INVALID_RATING_PATTERN.pattern, na=False)
+    except AttributeError:
+        return pd.Series(True, index=series.index)
+
+# Aturan validasi: check menerima kolom dan mengembalikan mask (True = valid), expr adalah
+# padanannya untuk ekspresi Polars (null dianggap lolos, sama seperti None != 'x' di pandas).
+# parsed=True berarti aturan memakai nilai hasil parse jika tersedia (lihat validate_products).
+ValidationRule = namedtuple("ValidationRule", ["name", "column", "check", "expr", "parsed"], defaults=(None, False))
+ValidationResult = namedtuple("ValidationResult", ["mask", "counts", "rejected"])
+
+VALIDATION_RULES = (
+    ValidationRule("missing_title", "Title", _is_not_none, lambda c: c.is_not_null()),
+    ValidationRule("unknown_title", "Title", lambda s: s != 'Unknown Product', lambda c: c != 'Unknown Product'),
+    ValidationRule("price_unavailable", "Price", lambda s: ~s.isin(['Price Unavailable', None]),
+                   lambda c: ~(c.is_in(['Price Unavailable']) | c.is_null())),
+    ValidationRule("invalid_rating", "Rating", _is_valid_rating_text,
+                   lambda c: ~c.str.contains(INVALID_RATING_PATTERN.pattern).fill_null(False)),
+    ValidationRule("missing_rating", "Rating", lambda s: s.notna(), lambda c: c.is_not_null(), parsed=True),
+)
+
+# Aturan remove_invalid_products: mempertahankan filter aslinya untuk DataFrame hasil transform
+# (Rating dicocokkan persis, Title None tidak dihapus) sehingga tidak menolak lebih banyak baris
+CLEANUP_RATING_VALUES = ['Invalid Rating/5', 'Not Rated']
+CLEANUP_RULES = tuple(rule for rule in VALIDATION_RULES if rule.name in ("unknown_title", "price_unavailable")) + (
+    ValidationRule("invalid_rating", "Rating", lambda s: ~s.isin(CLEANUP_RATING_VALUES),
+                   lambda c: ~c.is_in(CLEANUP_RATING_VALUES).fill_null(False)),
+    ValidationRule("missing_rating", "Rating", lambda s: s.notna(), lambda c: c.is_not_null()),
+)
+
+def validate_products(df, rules=VALIDATION_RULES, parsed=None, quarantine=None, strict=False):
+    """Gabungkan semua aturan menjadi satu mask boolean tanpa menyalin DataFrame.
+
+    parsed adalah dict kolom -> Series hasil parse untuk aturan dengan
+    parsed=True. counts berisi jumlah baris yang gagal per aturan (satu baris
+    bisa gagal di beberapa aturan). Jika quarantine diberikan, baris yang
+    ditolak dikirim ke sana dan dikembalikan di `rejected`. Aturan yang error
+    dilewati dengan warning, kecuali strict=True.
+    """
+    parsed = parsed or {}
+    valid = pd.Series(True, index=df.index)
+    counts = {}
+    for rule in rules:
+        try:
+            column = parsed[rule.column] if rule.parsed and rule.column in parsed else df[rule.column]
+            passed = rule.check(column)
+            if passed.dtype != bool:
+                # Perbandingan pada kolom pyarrow menghasilkan NA untuk nilai kosong
+                passed = passed.fillna(True).astype(bool)
+        except Exception as e:
+            if strict:
+                raise
+            logger.warning(f"Error applying validation rule {rule.name}: {e}")
+            continue
+        counts[rule.name] = int((~passed).sum())
+        valid &= passed
+
+    rejected = None
+    if quarantine is not None and not valid.all():
+        rejected = df[~valid]
+        quarantine(rejected)
+    logger.info(f"Validation rejections per rule: {counts}")
+    return ValidationResult(valid, counts, rejected)
+
+def resolve_engine(engine):
+    """Validasi nama engine transformasi, fallback ke 'pandas' jika library tidak terinstall."""
+    if engine not in TRANSFORM_ENGINES:
+        raise ValueError(f"Unknown transform engine '{engine}'. Choose one of {TRANSFORM_ENGINES}.")
+    if engine == "pandas":
+        return engine
+    # Engine polars juga membutuhkan pyarrow untuk to_pandas()
+    if pa is None or (engine == "polars" and pl is None):
+        logger.warning(f"Transform engine '{engine}' is not installed. Falling back to 'pandas'.")
+        return "pandas"
+    return engine
+
+def transform_product_data(raw_data, compact_schema=False, quarantine=None, engine=DEFAULT_ENGINE):
+    """Mengubah data menjadi DataFrame dengan error handling.
+
+    raw_data bisa berupa list dict, list ProductRecord, ProductBatch atau DataFrame.
+    VALIDATION_RULES digabung menjadi satu mask lalu DataFrame difilter
+    sekali; Price dan Rating masing-masing diparse dengan satu regex yang
+    sudah dikompilasi. quarantine (opsional) menerima baris mentah yang
+    ditolak. Dengan compact_schema=True hasilnya dilewatkan ke
+    compact_product_dtypes.
+
+    engine: 'pandas' (kolom object), 'pyarrow' (kolom teks string[pyarrow])
+    atau 'polars' (LazyFrame). Semua engine memakai VALIDATION_RULES dan
+    menghasilkan pandas DataFrame dengan kolom yang sama, Price int64 dan
+    Rating float64; kolom teks berupa string[pyarrow] untuk engine 'pyarrow'.
+    """
     try:
-        if not raw_data:
+        if raw_data is None or not len(raw_data):
             logger.warning("raw_data is empty. Returning empty DataFrame.")
             return pd.DataFrame()
-        
-        df = pd.DataFrame(raw_data)
-        
-        # Filter out None values from extraction
-        df = df[df.apply(lambda row: row['Title'] is not None, axis=1)]
+
+        engine = resolve_engine(engine)
+        if engine == "polars":
+            df = _transform_polars(raw_data, quarantine)
+            return compact_product_dtypes(df) if compact_schema else df
+
+        df = records_to_dataframe(raw_data)
+        if engine == "pyarrow":
+            df = df.astype({column: pd.ArrowDtype(pa.string()) for column in df.columns if df[column].dtype == object})
         
         logger.info(f"DataFrame created with {len(df)} products.")
         logger.debug(f"DataFrame structure:\n{df.head()}")
 
-        # STEP 1: Hapus data invalid terlebih dahulu (sebelum transformasi)
-        # Hapus baris dengan Title = 'Unknown Product'
+        # STEP 1: Transformasi Rating pada seluruh kolom agar Rating NaN ikut masuk mask
         try:
-            df = df[df['Title'] != 'Unknown Product']
+            rating = df['Rating'].str.extract(RATING_PATTERN.pattern, expand=False)
+            rating = pd.to_numeric(rating, errors='coerce').astype('float64')
         except Exception as e:
-            logger.warning(f"Error filtering 'Unknown Product': {e}")
+            logger.error(f"Error transforming Rating column: {e}")
+            rating = pd.Series(None, index=df.index, dtype='float64')
 
-        # Hapus baris dengan Price yang tidak valid
-        try:
-            df = df[~df['Price'].isin(['Price Unavailable', None])]
-        except Exception as e:
-            logger.warning(f"Error filtering invalid prices: {e}")
+        # STEP 2: Satu mask dari semua aturan validasi
+        valid = validate_products(df, parsed={'Rating': rating}, quarantine=quarantine).mask
 
-        # Hapus baris dengan Rating yang mengandung "Invalid" atau "Not Rated"
-        try:
-            df = df[~df['Rating'].str.contains('Invalid|Not Rated', regex=True, na=False)]
-        except Exception as e:
-            logger.warning(f"Error filtering invalid ratings: {e}")
+        # STEP 3: Filter sekali
+        df = df[valid]
+        df['Rating'] = rating[valid]
 
-        # STEP 2: Transformasi Price (sekarang data sudah valid)
+        # STEP 4: Transformasi Price (sekarang data sudah valid)
         try:
-            df['Price'] = (df['Price'].str.replace(r'[^0-9.]', '', regex=True).astype(float) * 16000).astype(int)
+            df['Price'] = (df['Price'].str.replace(PRICE_CLEAN_PATTERN.pattern, '', regex=True).astype(float) * 16000).astype(int)
         except Exception as e:
             logger.error(f"Error transforming Price column: {e}")
             df['Price'] = None
         
-        # STEP 3: Transformasi Rating
-        try:
-            df['Rating'] = df['Rating'].str.replace('⭐', '').str.strip()
-            df['Rating'] = df['Rating'].str.extract(r'([\d.]+)')[0]
-            df['Rating'] = pd.to_numeric(df['Rating'], errors='coerce')
-        except Exception as e:
-            logger.error(f"Error transforming Rating column: {e}")
-            df['Rating'] = None
-        
-        # STEP 4: Hapus baris dengan Rating yang NaN
-        try:
-            df = df[df['Rating'].notna()]
-        except Exception as e:
-            logger.warning(f"Error removing NaN ratings: {e}")
-        
         logger.info(f"Transformation complete. Final count: {len(df)} products")
-        return df.reset_index(drop=True)
+        df = df.reset_index(drop=True)
+        return compact_product_dtypes(df) if compact_schema else df
     
     except ValueError as e:
         logger.error(f"ValueError during data transformation: {e}")
@@ -107,14 +222,213 @@ def transform_product_data(raw_data):
         logger.error(f"Unexpected error during transformation: {e}")
         return pd.DataFrame()
 
+def _records_to_polars(raw_data):
+    """Ubah raw_data menjadi polars DataFrame dengan semua kolom bertipe teks."""
+    if isinstance(raw_data, pd.DataFrame):
+        frame = pl.from_pandas(raw_data)
+    elif isinstance(raw_data, ProductBatch):
+        frame = pl.DataFrame(raw_data.columns, schema={field: pl.Utf8 for field in FIELDS})
+    elif isinstance(raw_data, list) and raw_data and isinstance(raw_data[0], tuple):
+        frame = pl.DataFrame(raw_data, schema={field: pl.Utf8 for field in FIELDS}, orient="row")
+    else:
+        frame = pl.from_dicts(list(raw_data), infer_schema_length=None)
+    return frame.with_columns(pl.col(pl.Null).cast(pl.Utf8))
+
+def _transform_polars(raw_data, quarantine=None, rules=VALIDATION_RULES):
+    """Implementasi engine 'polars' dari transform_product_data (hasil berupa pandas DataFrame)."""
+    frame = _records_to_polars(raw_data)
+    columns = frame.columns
+    logger.info(f"DataFrame created with {len(frame)} products.")
+
+    # STEP 1-2: Rating diparse dan semua aturan dievaluasi dalam satu LazyFrame
+    rating = pl.col('Rating').str.extract(RATING_PATTERN.pattern, 1).cast(pl.Float64, strict=False)
+    masks = []
+    for rule in rules:
+        if rule.expr is None or rule.column not in columns:
+            logger.warning(f"Skipping validation rule {rule.name} for polars engine")
+            continue
+        column = rating if rule.parsed and rule.column == 'Rating' else pl.col(rule.column)
+        masks.append(rule.expr(column).fill_null(True).alias(f"_rule_{rule.name}"))
+    mask_names = [mask.meta.output_name() for mask in masks]
+    checked = (
+        frame.lazy()
+        .with_columns(rating.alias('_rating'), *masks)
+        .with_columns(pl.all_horizontal(mask_names).alias('_valid') if masks else pl.lit(True).alias('_valid'))
+        .collect()
+    )
+    counts = {name[len("_rule_"):]: int(len(checked) - checked[name].sum()) for name in mask_names}
+    logger.info(f"Validation rejections per rule: {counts}")
+    if quarantine is not None and not checked['_valid'].all():
+        quarantine(checked.filter(~pl.col('_valid')).select(columns).to_pandas())
+
+    # STEP 3: Filter sekali
+    df = checked.filter(pl.col('_valid')).with_columns(pl.col('_rating').alias('Rating')).select(columns)
+
+    # STEP 4: Transformasi Price (sekarang data sudah valid)
+    try:
+        df = df.with_columns(
+            (pl.col('Price').str.replace_all(PRICE_CLEAN_PATTERN.pattern, '').cast(pl.Float64) * 16000).cast(pl.Int64)
+        )
+    except Exception as e:
+        logger.error(f"Error transforming Price column: {e}")
+        df = df.with_columns(pl.lit(None).alias('Price'))
 
+    logger.info(f"Transformation complete. Final count: {len(df)} products")
+    return df.to_pandas()
 
+def compact_product_dtypes(df):
+    """Ubah DataFrame hasil transformasi ke skema ringkas.
 
+    Color/Size/Gender menjadi category, Price int32 (jika muat), Rating
+    float32 dan Timestamp datetime64. Penghematan memori (memory_usage
+    deep=True) dicatat di log dan di df.attrs['memory_usage'].
+    """
+    if df is None or df.empty:
+        return df
+    try:
+        before = int(df.memory_usage(deep=True).sum())
+        df = df.astype({column: 'category' for column in COMPACT_CATEGORY_COLUMNS if column in df.columns})
 
+        if 'Price' in df.columns and pd.api.types.is_integer_dtype(df['Price']):
+            if df['Price'].abs().max() <= INT32_MAX:
+                df['Price'] = df['Price'].astype('int32')
+        if 'Rating' in df.columns and pd.api.types.is_float_dtype(df['Rating']):
+            df['Rating'] = df['Rating'].astype('float32')
+        if 'Timestamp' in df.columns and not pd.api.types.is_datetime64_any_dtype(df['Timestamp']):
+            parsed = pd.to_datetime(df['Timestamp'], format=TIMESTAMP_FORMAT, errors='coerce')
+            # Hanya dikonversi jika semua nilai sesuai format agar tidak ada data yang hilang
+            if parsed.notna().sum() == df['Timestamp'].notna().sum():
+                df['Timestamp'] = parsed
+
+        after = int(df.memory_usage(deep=True).sum())
+        df.attrs['memory_usage'] = {'before': before, 'after': after}
+        logger.info(f"Compact schema: memory {before / 1024:.1f} KiB -> {after / 1024:.1f} KiB "
+                    f"(saved {1 - after / before:.1%}).")
+        return df
+    except Exception as e:
+        logger.error(f"Error compacting DataFrame dtypes: {e}")
+        return df
 
+def iter_record_chunks(records, chunk_size=DEFAULT_CHUNK_SIZE):
+    """Kelompokkan iterable produk (misalnya iter_products) menjadi list berisi maksimal chunk_size produk."""
+    iterator = iter(records)
+    while chunk := list(islice(iterator, chunk_size)):
+        yield chunk
 
+def iter_transform_product_data(batches, compact_schema=False, quarantine=None, engine=DEFAULT_ENGINE):
+    """Versi streaming transform_product_data.
 
+    batches adalah iterable batch produk (list dict/ProductRecord atau
+    ProductBatch, lihat iter_record_chunks); setiap batch ditransformasi
+    dengan aturan yang sama dan menghasilkan satu DataFrame, sehingga memori
+    puncak dibatasi ukuran batch. Batch yang kosong setelah filter dilewati.
+    """
+    total = 0
+    for batch in batches:
+        if not len(batch):
+            continue
+        chunk = transform_product_data(batch, compact_schema, quarantine, engine)
+        if chunk.empty:
+            continue
+        total += len(chunk)
+        yield chunk
+    logger.info(f"Streaming transformation complete. Final count: {total} products")
 
+def iter_remove_invalid_products(chunks, quarantine=None):
+    """Versi streaming remove_invalid_products untuk DataFrame dari iter_transform_product_data."""
+    total = 0
+    for chunk in chunks:
+        chunk = remove_invalid_products(chunk, quarantine)
+        if chunk.empty:
+            continue
+        total += len(chunk)
+        yield chunk
+    logger.info(f"Streaming cleaning complete. Remaining: {total} products")
 
+def product_fingerprints(df, key=DEDUP_KEY):
+    """Hash 64-bit (uint64) per baris dari kolom natural key, dihitung secara vektor."""
+    return pd.util.hash_pandas_object(df[list(key)], index=False)
 
+def deduplicate_products(df, store=None, key=DEDUP_KEY, record=True):
+    """Hapus produk duplikat dalam satu run dan yang sudah dimuat pada run sebelumnya.
 
+    store adalah FingerprintStore (opsional). Dengan record=True fingerprint
+    produk baru langsung disimpan ke store sehingga run berikutnya
+    melewatinya. Jika hasilnya masih akan dimuat ke sink, pakai record=False
+    lalu record_fingerprints setelah load berhasil agar produk dari load yang
+    gagal tidak ikut dilewati.
+    """
+    try:
+        if df is None or df.empty:
+            return df
+
+        initial_count = len(df)
+        fingerprints = product_fingerprints(df, key)
+        keep = ~fingerprints.duplicated().to_numpy()
+        in_run = initial_count - int(keep.sum())
+
+        seen_before = 0
+        if store is not None:
+            known = store.contains(fingerprints.to_numpy()) & keep
+            seen_before = int(known.sum())
+            keep &= ~known
+
+        df = df[keep].reset_index(drop=True)
+        if store is not None and record:
+            store.add(fingerprints.to_numpy()[keep])
+
+        logger.info(f"Deduplication: removed {in_run} in-run duplicates and {seen_before} "
+                    f"previously loaded products. Remaining: {len(df)}")
+        return df
+    except KeyError as e:
+        logger.error(f"Column not found for deduplication key: {e}")
+        return df
+    except Exception as e:
+        logger.error(f"Error deduplicating products: {e}")
+        return df
+
+def record_fingerprints(df, store, key=DEDUP_KEY):
+    """Simpan fingerprint produk yang sudah berhasil dimuat; kembalikan jumlah fingerprint baru."""
+    try:
+        if df is None or df.empty:
+            return 0
+        added = store.add(product_fingerprints(df, key).to_numpy())
+        logger.info(f"Recorded {added} new product fingerprints")
+        return added
+    except Exception as e:
+        logger.error(f"Error recording product fingerprints: {e}")
+        return 0
+
+def transform_product_data_parallel(raw_data, workers=None, partition_size=None, min_rows=PARALLEL_MIN_ROWS,
+                                    compact_schema=False, engine=DEFAULT_ENGINE):
+    """transform_product_data multi-core: data dipartisi dan ditransformasi di ProcessPoolExecutor.
+
+    Partisi diproses dengan aturan yang sama lalu digabung sesuai urutan
+    aslinya. Default partition_size membagi data menjadi PARTITIONS_PER_WORKER
+    partisi per worker. Input di bawah min_rows (atau workers <= 1) diproses
+    di satu proses karena overhead pickling lebih besar dari keuntungannya
+    (lihat benchmarks/bench_transform_parallel.py).
+    """
+    workers = workers or os.cpu_count() or 1
+    total = 0 if raw_data is None else len(raw_data)
+    if workers <= 1 or total < max(min_rows, 2):
+        return transform_product_data(raw_data, compact_schema, engine=engine)
+
+    try:
+        df = records_to_dataframe(raw_data)
+        partition_size = partition_size or -(-total // (workers * PARTITIONS_PER_WORKER))
+        partitions = [df.iloc[start:start + partition_size] for start in range(0, total, partition_size)]
+        logger.info(f"Parallel transformation: {len(partitions)} partitions of {partition_size} rows, {workers} workers")
+
+        with ProcessPoolExecutor(max_workers=min(workers, len(partitions))) as pool:
+            chunks = [chunk for chunk in pool.map(partial(transform_product_data, engine=engine), partitions) if not chunk.empty]
+        if not chunks:
+            return pd.DataFrame()
+
+        # Skema ringkas diterapkan setelah digabung agar kategori konsisten antar partisi
+        df = pd.concat(chunks, ignore_index=True)
+        logger.info(f"Parallel transformation complete. Final count: {len(df)} products")
+        return compact_product_dtypes(df) if compact_schema else df
+    except Exception as e:
+        logger.error(f"Error during parallel transformation, falling back to single process: {e}")
+        return transform_product_data(raw_data, compact_schema, engine=engine)